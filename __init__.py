@@ -12,29 +12,33 @@ import importlib, sys
 import os
 
 # Add user site-packages to sys.path for websockets library
-user_site_packages = os.path.join(os.path.expanduser("~"), "AppData", "Roaming", "Python", "Python311", "site-packages")
-if os.path.exists(user_site_packages) and user_site_packages not in sys.path:
-    sys.path.insert(0, user_site_packages)
-    print(f"[RenderMind] Added to path: {user_site_packages}")
+# (Windows-only layout - skip the path probe entirely elsewhere)
+if sys.platform == 'win32':
+    user_site_packages = os.path.join(
+        os.environ.get('APPDATA', ''), "Python",
+        f"Python{sys.version_info.major}{sys.version_info.minor}", "site-packages")
+    if os.path.exists(user_site_packages) and user_site_packages not in sys.path:
+        sys.path.insert(0, user_site_packages)
+        print(f"[RenderMind] Added to path: {user_site_packages}")
 
-# Import from blender_addon package
-from .blender_addon import ui_panel_modal, operators, model_library, plan_emitter, dev_reload, blender_utils
-from . import model_interface
+# Submodules in registration order - the single source of truth for
+# register/unregister/reload. Imported lazily on first use so Blender's
+# startup doesn't pay for modules (bpy.types metaclass work, requests,
+# websockets) until register() actually needs them.
+SUBMODULES = ["blender_addon.blender_utils", "blender_addon.model_library",
+              "model_interface", "blender_addon.plan_emitter",
+              "blender_addon.operators", "blender_addon.ui_panel_modal",
+              "websocket_server", "blender_addon.dev_reload"]
 
-# Try to import websocket_server (requires 'websockets' library)
-HAS_WEBSOCKET = False
-try:
-    from . import websocket_server
-    HAS_WEBSOCKET = True
-except ImportError as e:
-    print(f"RenderMind: websockets library not found - {e}")
-    print("RenderMind: Install with: python -m pip install websockets")
+_lazy = {}
 
-SUBMODULES = ["blender_addon.ui_panel_modal", "blender_addon.operators", "model_interface", 
-              "blender_addon.plan_emitter", "blender_addon.dev_reload", "blender_addon.model_library",
-              "blender_addon.blender_utils"]
-if HAS_WEBSOCKET:
-    SUBMODULES.append("websocket_server")
+def _get(name):
+    """Import a submodule on first use and cache the module object"""
+    mod = _lazy.get(name)
+    if mod is None:
+        mod = importlib.import_module(f".{name}", __package__)
+        _lazy[name] = mod
+    return mod
 
 # If reloading during dev, reload submodules so changes are picked up
 if __package__:
@@ -43,53 +47,32 @@ if __package__:
         if fq in sys.modules:
             importlib.reload(sys.modules[fq])
 
+_registered = []  # modules whose register() has run, in order
+
 def register():
-    # register submodules in order - each has register()/unregister()
-    blender_utils.register()
-    model_library.register()
-    model_interface.register()
-    plan_emitter.register()
-    operators.register()
-    ui_panel_modal.register()
-    if HAS_WEBSOCKET:
-        websocket_server.register()
-    dev_reload.register()
+    for name in SUBMODULES:
+        try:
+            mod = _get(name)
+        except ImportError as e:
+            # Only websocket_server is optional (it needs the
+            # 'websockets' library); a core module failing to import is
+            # a real breakage the user must see, not a console line
+            if name != "websocket_server":
+                raise
+            print(f"RenderMind: could not load {name} - {e}")
+            print("RenderMind: Install with: python -m pip install websockets")
+            continue
+        mod.register()
+        _registered.append(mod)
 
 def unregister():
-    # unregister in reverse order
-    try:
-        dev_reload.unregister()
-    except Exception:
-        pass
-    if HAS_WEBSOCKET:
+    # unregister in reverse registration order
+    while _registered:
+        mod = _registered.pop()
         try:
-            websocket_server.unregister()
-        except Exception:
-            pass
-    try:
-        ui_panel_modal.unregister()
-    except Exception:
-        pass
-    try:
-        operators.unregister()
-    except Exception:
-        pass
-    try:
-        plan_emitter.unregister()
-    except Exception:
-        pass
-    try:
-        model_interface.unregister()
-    except Exception:
-        pass
-    try:
-        model_library.unregister()
-    except Exception:
-        pass
-    try:
-        blender_utils.unregister()
-    except Exception:
-        pass
+            mod.unregister()
+        except Exception as e:
+            print(f"[RenderMind] unregister {mod.__name__}: {e}")
 
 if __name__ == "__main__":
     register()
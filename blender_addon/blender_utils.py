@@ -1,37 +1,41 @@
 import bpy
-import tempfile, os
-from datetime import datetime
+import os
+import re
+from functools import lru_cache
 
 from bpy.props import StringProperty, BoolProperty, IntProperty, PointerProperty, CollectionProperty, EnumProperty, FloatProperty
 from bpy.types import PropertyGroup
 
 # ---- Chat Message Properties ----
+
+# Role / status codes for RMChatMessage - stored as plain ints instead of
+# per-message enum identifier strings; map back to names at the edges
+# (UI labels, web UI JSON) via the *_NAMES tuples
+ROLE_USER, ROLE_AI, ROLE_SYSTEM = range(3)
+ROLE_NAMES = ('USER', 'AI', 'SYSTEM')
+STATUS_NONE, STATUS_THINKING, STATUS_SUCCESS, STATUS_ERROR = range(4)
+STATUS_NAMES = ('NONE', 'THINKING', 'SUCCESS', 'ERROR')
+
+# Monotonic chat-history version - bumped by every code path that adds,
+# edits or clears chat messages, so caches of serialized history (the
+# websocket get_messages blob) can key on it instead of guessing from
+# message counts and lengths
+chat_version = 0
+
+def bump_chat_version():
+    global chat_version
+    chat_version += 1
+
 class RMChatMessage(PropertyGroup):
     """Represents a single message in the chat conversation"""
-    role: EnumProperty(
-        name="Role",
-        items=[
-            ('USER', "User", "User message"),
-            ('AI', "AI", "AI response"),
-            ('SYSTEM', "System", "System message")
-        ],
-        default='USER'
-    )
+    role: IntProperty(name="Role", default=ROLE_USER, min=0, max=2)
     content: StringProperty(name="Message Content", default="")
     code: StringProperty(name="Generated Code", default="")
     timestamp: StringProperty(name="Timestamp", default="")
-    status: EnumProperty(
-        name="Status",
-        items=[
-            ('NONE', "None", "No status"),
-            ('THINKING', "Thinking", "AI is generating"),
-            ('SUCCESS', "Success", "Executed successfully"),
-            ('ERROR', "Error", "Execution failed")
-        ],
-        default='NONE'
-    )
+    status: IntProperty(name="Status", default=STATUS_NONE, min=0, max=3)
     error_msg: StringProperty(name="Error Message", default="")
     show_code: BoolProperty(name="Show Code", default=False)
+    cache_info: StringProperty(name="Prompt Cache Info", default="")
 
 # ---- Legacy Properties (kept for compatibility) ----
 class RMVariant(PropertyGroup):
@@ -70,6 +74,15 @@ class RMProps(PropertyGroup):
     temperature: FloatProperty(name="Temperature", default=0.7, min=0.0, max=2.0)
     auto_execute: BoolProperty(name="Auto Execute", default=True)
     show_advanced: BoolProperty(name="Show Advanced", default=False)
+    cache_mode: EnumProperty(
+        name="Response Cache",
+        items=[
+            ('ON', "On", "Read and write cached AI responses"),
+            ('READ_ONLY', "Read Only", "Use cached responses but don't store new ones"),
+            ('OFF', "Off", "Always call the model")
+        ],
+        default='ON'
+    )
     
     # Legacy properties (kept for compatibility)
     prompt_text: StringProperty(name="Prompt Text", default="Create a vase", maxlen=1024)
@@ -87,24 +100,36 @@ FORBIDDEN_TOKENS = [
     "bpy.ops.wm.open_mainfile", "bpy.ops.wm.read_homefile"
 ]
 
+# Single compiled alternation: one C-level pass over the script instead
+# of one substring scan per forbidden token
+_FORBIDDEN_RE = re.compile('|'.join(re.escape(tok) for tok in FORBIDDEN_TOKENS))
+
 def validate_script(src: str):
-    for tok in FORBIDDEN_TOKENS:
-        if tok in src:
-            raise RuntimeError(f"Unsafe token detected in script: {tok}")
+    m = _FORBIDDEN_RE.search(src)
+    if m:
+        raise RuntimeError(f"Unsafe token detected in script: {m.group(0)}")
+
+@lru_cache(maxsize=64)
+def _compile_script(src: str):
+    """Validate and compile a script once; repeated runs of the same
+    generated source (common during iteration) skip parse+compile"""
+    validate_script(src)
+    return compile(src, '<rendermind>', 'exec')
 
 def exec_script_in_current_scene(script_src: str):
     """
     Executes script_src (which must define rendermind_action(context))
     in the current Blender Python environment.
     """
-    validate_script(script_src)
+    code = _compile_script(script_src)
     ns = {}
-    exec(script_src, ns)
+    exec(code, ns)
     if "rendermind_action" not in ns:
         raise RuntimeError("Script must define `rendermind_action(context)`")
     ns["rendermind_action"](bpy.context)
 
 def temp_thumbnail_path(name="rm_preview.png"):
+    import tempfile
     return os.path.join(tempfile.gettempdir(), name)
 
 # ---- Register / unregister for property groups ----
@@ -116,6 +141,7 @@ def register():
     bpy.types.Scene.rm_props = bpy.props.PointerProperty(type=RMProps)
 
 def unregister():
+    _compile_script.cache_clear()
     if hasattr(bpy.types.Scene, "rm_props"):
         del bpy.types.Scene.rm_props
     bpy.utils.unregister_class(RMProps)
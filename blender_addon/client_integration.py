@@ -1,11 +1,26 @@
 # blender_addon/client_integration.py
-import requests, bpy
+import bpy
 
 SERVER_URL = "http://127.0.0.1:5000/generate"  # change if server remote
 
+_SESSION = None
+
+def _session():
+    """Shared Session so HTTP keep-alive reuses the server connection
+    instead of opening a fresh socket per chat turn"""
+    global _SESSION
+    if _SESSION is None:
+        # Imported lazily so addon register doesn't pay for requests'
+        # transitive imports; sys.modules makes repeat calls free
+        import requests
+        _SESSION = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        _SESSION.mount('http://', adapter)
+    return _SESSION
+
 def ask_render_mind(instruction, timeout=30):
     try:
-        r = requests.post(SERVER_URL, json={"instruction": instruction}, timeout=timeout)
+        r = _session().post(SERVER_URL, json={"instruction": instruction}, timeout=timeout)
     except Exception as e:
         return None, f"Request failed: {e}"
     if r.status_code != 200:
@@ -0,0 +1,59 @@
+"""
+On-disk bytecode cache for AI-generated scripts.
+
+The lru_cache on compile covers one session; users iterating on a scene
+re-run the same generated snippets across sessions, so the compiled
+code objects are also spilled to ~/.cache/rendermind/code_cache via
+marshal. A warm start then costs a file read instead of a parse+compile.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import marshal
+import os
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "rendermind", "code_cache")
+
+
+def _cache_path(script: str) -> str:
+    digest = hashlib.sha256(script.encode('utf-8')).hexdigest()
+    # Marshalled bytecode is interpreter-specific, so the magic number is
+    # part of the filename - a Blender/Python upgrade misses cleanly
+    magic = importlib.util.MAGIC_NUMBER.hex()
+    return os.path.join(CACHE_DIR, f"{digest}.{magic}.pyc")
+
+
+@lru_cache(maxsize=64)
+def load_or_compile(script: str):
+    """Return the compiled code object for a script, validated first.
+
+    Looks up the on-disk cache by content hash, compiling and storing on
+    a miss; memoized in-process so repeat calls skip the disk too.
+    """
+    from . import blender_utils
+    blender_utils.validate_script(script)
+
+    path = _cache_path(script)
+    try:
+        with open(path, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, ValueError, EOFError):
+        pass
+
+    code = compile(script, '<rendermind>', 'exec')
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            marshal.dump(code, f)
+        os.replace(tmp, path)
+    except OSError:
+        # Cache writes are best-effort; an unwritable home dir just
+        # means cold compiles every session
+        logger.debug("could not write code cache entry", exc_info=True)
+    return code
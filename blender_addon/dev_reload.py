@@ -6,18 +6,19 @@ class RM_OT_DevReload(bpy.types.Operator):
     bl_description = "Reload RenderMind addon modules (development helper)"
 
     def execute(self, context):
-        pkg = __package__
-        if not pkg:
+        if not __package__:
             self.report({'WARNING'}, "Package not set (use as addon, not run as script)")
             return {'CANCELLED'}
+        # root addon package (this module lives in <root>.blender_addon)
+        pkg = __package__.rpartition('.')[0]
         try:
-            # reload all submodules of this package
-            for name, mod in list(sys.modules.items()):
-                if name.startswith(pkg + "."):
+            # reload in registration order so no module ends up holding a
+            # stale reference to a dependency reloaded after it
+            from .. import SUBMODULES
+            for name in SUBMODULES:
+                mod = sys.modules.get(f"{pkg}.{name}")
+                if mod is not None:
                     importlib.reload(mod)
-            # attempt to reload root package as well
-            if pkg in sys.modules:
-                importlib.reload(sys.modules[pkg])
             # force UI redraw
             for window in bpy.context.window_manager.windows:
                 for area in window.screen.areas:
@@ -3,10 +3,36 @@ Model Library - Search and import 3D models from local collection
 """
 
 import bpy
+import json
+import logging
 import os
+import threading
 from pathlib import Path
 import re
 
+# Verbose logging is useful when debugging the asset index but dominates
+# search time on real libraries - enable via logging.basicConfig(level=DEBUG)
+log = logging.getLogger(__name__)
+
+# Supported file extensions
+SUPPORTED_FORMATS = {'.blend', '.fbx', '.obj', '.gltf', '.glb', '.stl'}
+
+# Common words like 'a', 'an', 'the', 'add', 'create', 'make' carry no
+# signal for matching filenames
+STOPWORDS = frozenset({'add', 'the', 'create', 'make', 'place', 'import', 'put'})
+
+# Strips common prefixes/suffixes (food_, _01.._09, _4k/_8k) in one
+# C-level substitution instead of five chained .replace() calls
+_CLEAN_RE = re.compile(r'food_|_0\d|_[48]k')
+
+# On-disk index of the assets tree, rebuilt only when the assets
+# directory changes (keyed by its mtime)
+INDEX_FILENAME = ".rm_index.json"
+INDEX_VERSION = 3  # bump when the entry layout changes to invalidate old caches
+_INDEX = None
+_INDEX_MTIME = None
+_INDEX_LOCK = threading.Lock()  # guards rebuilds between warm-up thread and searches
+
 
 def get_models_directory():
     """Get the assets directory path"""
@@ -15,120 +41,202 @@ def get_models_directory():
     return assets_dir
 
 
-def search_models(query):
+def _iter_assets(root):
+    """Yield a DirEntry per file under root - scandir keeps names and
+    stat results cached, avoiding per-file PurePath construction.
+
+    Unreadable directories are skipped (matching os.walk's default)
+    rather than aborting the whole index build, and directory symlinks
+    are not followed so a link cycle can't loop forever."""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+        except OSError as e:
+            log.debug("Skipping unreadable directory: %s", e)
+
+
+def _build_index(assets_dir):
+    """Walk the assets tree once and collect one entry per model file"""
+    assets_root = str(assets_dir)
+    entries = []
+    for file_entry in _iter_assets(assets_root):
+        file = file_entry.name
+        file_stem, file_ext = os.path.splitext(file)
+        file_ext = file_ext.lower()
+
+        if file_ext not in SUPPORTED_FORMATS:
+            continue
+
+        # Get relative category path
+        try:
+            rel_path = os.path.relpath(os.path.dirname(file_entry.path), assets_root)
+            category = rel_path if rel_path != '.' else 'root'
+        except Exception:
+            category = 'root'
+
+        file_stem = file_stem.lower()
+        # Remove common prefixes/suffixes for better matching
+        clean_stem = _CLEAN_RE.sub('', file_stem)
+
+        entries.append({
+            'path': file_entry.path,
+            'filename': file,
+            'stem': file_stem,
+            'clean': clean_stem,
+            'tokens': [t for t in re.split(r'[_\-\s]+', file_stem) if t],
+            'category': category,
+            'ext': file_ext
+        })
+    return entries
+
+
+def _load_index():
     """
-    Search for 3D model files matching the query
-    Returns list of (filepath, filename, category) tuples
+    Return the cached index of model files, rebuilding it only when
+    the assets directory mtime changes. Loads lazily on first search.
     """
+    global _INDEX, _INDEX_MTIME
+
     assets_dir = get_models_directory()
-    
-    print(f"[ModelLibrary] Assets directory: {assets_dir}")
-    print(f"[ModelLibrary] Directory exists: {assets_dir.exists()}")
-    
     if not assets_dir.exists():
-        print(f"[ModelLibrary] Assets directory not found!")
+        log.debug("Assets directory not found: %s", assets_dir)
         return []
-    
-    # Supported file extensions
-    supported_formats = {'.blend', '.fbx', '.obj', '.gltf', '.glb', '.stl'}
-    
+
+    dir_mtime = os.stat(assets_dir).st_mtime
+
+    # In-memory copy still fresh?
+    if _INDEX is not None and _INDEX_MTIME == dir_mtime:
+        return _INDEX
+
+    with _INDEX_LOCK:
+        return _load_index_locked(assets_dir, dir_mtime)
+
+
+def _load_index_locked(assets_dir, dir_mtime):
+    global _INDEX, _INDEX_MTIME
+
+    # Another thread may have rebuilt while we waited for the lock
+    if _INDEX is not None and _INDEX_MTIME == dir_mtime:
+        return _INDEX
+
+    # Try the on-disk cache next
+    index_path = assets_dir / INDEX_FILENAME
+    if index_path.exists():
+        try:
+            with open(index_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('mtime') == dir_mtime and cached.get('version') == INDEX_VERSION:
+                _INDEX = cached['entries']
+                for entry in _INDEX:
+                    entry['tokens'] = frozenset(entry['tokens'])
+                _INDEX_MTIME = dir_mtime
+                return _INDEX
+        except Exception as e:
+            log.debug("Failed to read index cache: %s", e)
+
+    # Stale or missing - rebuild from a single walk
+    log.debug("Rebuilding index for %s", assets_dir)
+    _INDEX = _build_index(assets_dir)
+    _INDEX_MTIME = dir_mtime
+
+    try:
+        with open(index_path, 'w') as f:
+            # The index lives inside the directory it tracks, so
+            # creating it bumps the directory mtime; stat after the
+            # open and record the post-create value, or the next
+            # search sees a phantom change and rebuilds a second time
+            dir_mtime = os.stat(assets_dir).st_mtime
+            json.dump({'version': INDEX_VERSION, 'mtime': dir_mtime, 'entries': _INDEX}, f)
+        _INDEX_MTIME = dir_mtime
+    except Exception as e:
+        log.debug("Failed to write index cache: %s", e)
+
+    # Token lists stay JSON-serializable on disk but become frozensets
+    # in memory so the scoring loop gets O(1) set operations
+    for entry in _INDEX:
+        entry['tokens'] = frozenset(entry['tokens'])
+
+    return _INDEX
+
+
+def search_models(query):
+    """
+    Search for 3D model files matching the query
+    Returns list of (filepath, filename, category) tuples
+    """
     # Normalize query for matching
     query_lower = query.lower().strip()
     query_words = query_lower.split()
-    
-    print(f"[ModelLibrary] Query: '{query_lower}', Words: {query_words}")
-    
+
+    log.debug("Query: '%s', Words: %s", query_lower, query_words)
+
+    # Filter meaningful query words - computed once per query, not per file
+    meaningful_words = [w for w in query_words if len(w) >= 3 and w not in STOPWORDS]
+    meaningful_set = frozenset(meaningful_words)
+
+    # One compiled alternation replaces the per-file any(word in ...) scans:
+    # a single C-level pass over each filename instead of W substring searches
+    word_re = re.compile('|'.join(re.escape(w) for w in meaningful_words)) if meaningful_words else None
+    long_words_set = frozenset(w for w in query_words if len(w) > 2)
+
     matches = []
-    file_count = 0
-    
-    # Walk through assets directory
-    for root, dirs, files in os.walk(assets_dir):
-        print(f"[ModelLibrary] Scanning directory: {root}")
-        print(f"[ModelLibrary] Files found: {files}")
-        for file in files:
-            file_count += 1
-            file_lower = file.lower()
-            file_path = Path(root) / file
-            file_ext = file_path.suffix.lower()
-            
-            print(f"[ModelLibrary] Checking file: {file} (ext: {file_ext})")
-            
-            # Check if it's a supported format
-            if file_ext not in supported_formats:
-                print(f"[ModelLibrary]   - Skipped (unsupported format)")
-                continue
-            
-            # Get relative category path
-            try:
-                rel_path = file_path.parent.relative_to(assets_dir)
-                category = str(rel_path) if str(rel_path) != '.' else 'root'
-            except:
-                category = 'root'
-            
-            # Score the match
+
+    for entry in _load_index():
+        file_stem = entry['stem']
+        clean_filename = entry['clean']
+
+        # Exact match gets highest score
+        if query_lower == file_stem or query_lower == clean_filename:
+            score = 100
+        # Check if any meaningful word matches the filename exactly
+        elif clean_filename in meaningful_set:
+            score = 100
+        # Check if any meaningful word is in cleaned filename
+        # (token-set intersection is O(1) per word; the regex only runs
+        # when a word matches as a substring of a larger token)
+        elif meaningful_set & entry['tokens'] or (word_re is not None and word_re.search(clean_filename)):
+            score = 90
+        # Check if query is in cleaned filename
+        elif query_lower in clean_filename:
+            score = 85
+        # Check if query is in original filename
+        elif query_lower in file_stem:
+            score = 80
+        # Check if all query words are in filename (only if 2+ words)
+        elif len(query_words) >= 2 and long_words_set and long_words_set.issubset(entry['tokens']):
+            score = 70
+        # Single word match (must be at least 4 chars to avoid false positives)
+        elif len(query_words) == 1 and len(query_lower) >= 4 and query_lower in file_stem:
+            score = 60
+        # Category match alone is not enough
+        else:
             score = 0
-            file_stem = file_path.stem.lower()
-            
-            print(f"[ModelLibrary]   - File stem: '{file_stem}', Category: '{category}'")
-            
-            # Remove common prefixes/suffixes for better matching
-            clean_filename = file_stem.replace('food_', '').replace('_01', '').replace('_02', '').replace('_4k', '').replace('_8k', '')
-            
-            print(f"[ModelLibrary]   - Clean filename: '{clean_filename}'")
-            
-            # Filter meaningful query words (exclude common words like 'a', 'an', 'the', 'add', 'create', 'make')
-            meaningful_words = [w for w in query_words if len(w) >= 3 and w not in ['add', 'the', 'create', 'make', 'place', 'import', 'put']]
-            print(f"[ModelLibrary]   - Meaningful words: {meaningful_words}")
-            
-            # Exact match gets highest score
-            if query_lower == file_stem or query_lower == clean_filename:
-                score = 100
-                print(f"[ModelLibrary]   - EXACT MATCH! Score: {score}")
-            # Check if any meaningful word matches the filename exactly
-            elif any(word == clean_filename for word in meaningful_words):
-                score = 100
-                print(f"[ModelLibrary]   - WORD EXACT MATCH! Score: {score}")
-            # Check if any meaningful word is in cleaned filename
-            elif any(word in clean_filename for word in meaningful_words):
-                score = 90
-                print(f"[ModelLibrary]   - Meaningful word in filename! Score: {score}")
-            # Check if query is in cleaned filename
-            elif query_lower in clean_filename:
-                score = 85
-                print(f"[ModelLibrary]   - Query in clean filename! Score: {score}")
-            # Check if query is in original filename
-            elif query_lower in file_stem:
-                score = 80
-                print(f"[ModelLibrary]   - Query in filename! Score: {score}")
-            # Check if all query words are in filename (only if 2+ words)
-            elif len(query_words) >= 2 and all(word in file_stem for word in query_words if len(word) > 2):
-                score = 70
-                print(f"[ModelLibrary]   - All words match! Score: {score}")
-            # Single word match (must be at least 4 chars to avoid false positives)
-            elif len(query_words) == 1 and len(query_lower) >= 4 and query_lower in file_stem:
-                score = 60
-                print(f"[ModelLibrary]   - Single word match! Score: {score}")
-            # Category match alone is not enough
-            else:
-                score = 0
-                print(f"[ModelLibrary]   - No match (score: 0)")
-            
-            if score > 0:
-                print(f"[ModelLibrary]   ✓ ADDED TO MATCHES")
-                matches.append({
-                    'path': str(file_path),
-                    'filename': file,
-                    'category': category,
-                    'score': score,
-                    'format': file_ext
-                })
-    
-    print(f"[ModelLibrary] Total files scanned: {file_count}")
-    print(f"[ModelLibrary] Total matches: {len(matches)}")
-    
+
+        if score > 0:
+            log.debug("Match: %s (score: %s)", entry['filename'], score)
+            matches.append({
+                'path': entry['path'],
+                'filename': entry['filename'],
+                'category': entry['category'],
+                'score': score,
+                'format': entry['ext']
+            })
+
+    log.debug("Total matches: %s", len(matches))
+
     # Sort by score (highest first)
     matches.sort(key=lambda x: x['score'], reverse=True)
-    
+
     return matches
 
 
@@ -146,27 +254,45 @@ def import_model(filepath, collection_name=None):
     imported_objects = []
     
     try:
-        # Store objects before import
-        objects_before = set(bpy.data.objects)
-        
+        # bpy.data.objects is kept sorted by name, not append order, so
+        # new arrivals can land anywhere - a name-set snapshot is the
+        # cheapest safe way to diff it after an operator import
+        names_before = {obj.name for obj in bpy.data.objects}
+
+        # Resolve the target collection up front so the .blend path can
+        # link objects straight into it (no unlink/relink pass later)
+        target_collection = None
+        if collection_name:
+            target_collection = bpy.data.collections.get(collection_name)
+            if target_collection is None:
+                target_collection = bpy.data.collections.new(collection_name)
+                bpy.context.scene.collection.children.link(target_collection)
+
         # Import based on file type
         if file_ext == '.blend':
-            # Import from .blend file
+            # Import from .blend file - filter out empty names before
+            # assignment so only real objects are materialized
             with bpy.data.libraries.load(str(file_path), link=False) as (data_from, data_to):
-                data_to.objects = data_from.objects
-            
-            # Add to scene
+                data_to.objects = [name for name in data_from.objects if name]
+
+            # Link directly into the destination collection
+            dest = target_collection or bpy.context.collection
             for obj in data_to.objects:
                 if obj is not None:
-                    bpy.context.collection.objects.link(obj)
+                    dest.objects.link(obj)
                     imported_objects.append(obj)
         
         elif file_ext == '.fbx':
             bpy.ops.import_scene.fbx(filepath=str(file_path))
         
         elif file_ext == '.obj':
-            bpy.ops.import_scene.obj(filepath=str(file_path))
-        
+            if bpy.app.version >= (3, 3):
+                # C importer (Blender 3.3+), much faster than the legacy
+                # Python import_scene.obj operator
+                bpy.ops.wm.obj_import(filepath=str(file_path))
+            else:
+                bpy.ops.import_scene.obj(filepath=str(file_path))
+
         elif file_ext in ['.gltf', '.glb']:
             bpy.ops.import_scene.gltf(filepath=str(file_path))
         
@@ -178,25 +304,18 @@ def import_model(filepath, collection_name=None):
         
         # Get newly imported objects (for formats using operators)
         if not imported_objects:
-            objects_after = set(bpy.data.objects)
-            imported_objects = list(objects_after - objects_before)
+            imported_objects = [obj for obj in bpy.data.objects
+                                if obj.name not in names_before]
         
-        # Move to collection if specified
-        if collection_name and imported_objects:
-            # Create or get collection
-            if collection_name not in bpy.data.collections:
-                collection = bpy.data.collections.new(collection_name)
-                bpy.context.scene.collection.children.link(collection)
-            else:
-                collection = bpy.data.collections[collection_name]
-            
-            # Move objects to collection
+        # Operator-based importers link into the context collection, so
+        # those objects still need moving (.blend already linked directly)
+        if target_collection and imported_objects and file_ext != '.blend':
             for obj in imported_objects:
                 # Unlink from current collections
                 for coll in obj.users_collection:
                     coll.objects.unlink(obj)
                 # Link to target collection
-                collection.objects.link(obj)
+                target_collection.objects.link(obj)
         
         obj_names = [obj.name for obj in imported_objects]
         return True, f"Imported {len(imported_objects)} object(s): {', '.join(obj_names)}", imported_objects
@@ -211,56 +330,47 @@ def generate_import_code(model_info, user_prompt):
     """
     filepath = model_info['path'].replace('\\', '\\\\')  # Escape backslashes
     filename = model_info['filename']
-    
-    code = f'''import bpy
-from pathlib import Path
+    file_ext = model_info['format']
+
+    # Two compact templates (.blend vs operator-based) instead of one
+    # long if/elif script - less source to parse on every execution
+    if file_ext == '.blend':
+        code = f'''import bpy
 
 def rendermind_action(context):
     """Import {filename} model"""
-    
-    # Model path
     model_path = r"{filepath}"
-    
-    # Import the model
-    file_ext = Path(model_path).suffix.lower()
-    
-    print(f"Importing {{file_ext}} model: {filename}")
-    
-    try:
-        if file_ext == '.blend':
-            with bpy.data.libraries.load(model_path, link=False) as (data_from, data_to):
-                data_to.objects = data_from.objects
-            
-            # Link objects to the current scene collection
-            for obj in data_to.objects:
-                if obj is not None:
-                    bpy.context.collection.objects.link(obj)
-                    print(f"Imported: {{obj.name}}")
-        
-        elif file_ext == '.fbx':
-            bpy.ops.import_scene.fbx(filepath=model_path)
-        
-        elif file_ext == '.obj':
-            bpy.ops.import_scene.obj(filepath=model_path)
-        
-        elif file_ext in ['.gltf', '.glb']:
-            bpy.ops.import_scene.gltf(filepath=model_path)
-        
-        elif file_ext == '.stl':
-            bpy.ops.import_mesh.stl(filepath=model_path)
-        
-        print(f"✓ Successfully imported {filename}")
-        
-    except Exception as e:
-        print(f"✗ Import failed: {{e}}")
-        raise
+    with bpy.data.libraries.load(model_path, link=False) as (data_from, data_to):
+        data_to.objects = [name for name in data_from.objects if name]
+    for obj in data_to.objects:
+        if obj is not None:
+            bpy.context.collection.objects.link(obj)
+    print(f"✓ Successfully imported {filename}")
 '''
-    
+    else:
+        code = f'''import bpy
+
+def rendermind_action(context):
+    """Import {filename} model"""
+    model_path = r"{filepath}"
+    importers = {{
+        '.fbx': bpy.ops.import_scene.fbx,
+        '.obj': bpy.ops.wm.obj_import if bpy.app.version >= (3, 3) else bpy.ops.import_scene.obj,
+        '.gltf': bpy.ops.import_scene.gltf,
+        '.glb': bpy.ops.import_scene.gltf,
+        '.stl': bpy.ops.import_mesh.stl,
+    }}
+    importers['{file_ext}'](filepath=model_path)
+    print(f"✓ Successfully imported {filename}")
+'''
+
     return code
 
 
 def register():
-    pass
+    # Warm the index off the main thread so the first search doesn't pay
+    # for a cold directory scan; the walk releases the GIL during I/O
+    threading.Thread(target=_load_index, daemon=True).start()
 
 
 def unregister():
@@ -1,7 +1,31 @@
-import bpy, traceback, os
+import bpy, os
+import itertools
+import logging
+import queue
+import threading
 from datetime import datetime
 from .. import model_interface
-from . import plan_emitter, blender_utils
+from . import compile_cache, plan_emitter, blender_utils, response_cache
+
+# Module logger - logger.exception() skips traceback formatting and
+# the synchronous stderr write entirely when the level is disabled;
+# enable with logging.getLogger('rendermind').setLevel(logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# The chat panel only ever shows the first 8 content lines, so bound the
+# stored text at insertion (2x the display limit for headroom) rather
+# than splitting an arbitrarily long response on every redraw. Code is
+# kept whole - Run/Copy need the full payload.
+_MAX_CONTENT_LINES = 16
+
+# Quick-action prompt prefixes, hoisted so Send can recognize an
+# unmodified template and refuse it before paying for an inference call
+_QUICK_TEMPLATES = {
+    'CREATE': "Create a ",
+    'MODIFY': "Modify the selected object to ",
+    'MATERIAL': "Add a material that "
+}
+_QUICK_TEMPLATE_SET = frozenset(v.strip() for v in _QUICK_TEMPLATES.values())
 
 # ---- Modern Chat Operators ----
 
@@ -10,82 +34,209 @@ class RM_OT_SendMessage(bpy.types.Operator):
     bl_idname = "rm.send_message"
     bl_label = "Send Message"
     bl_description = "Send your message to RenderMind AI"
-    
-    def execute(self, context):
+
+    _timer = None
+    _queue = None
+    _cancel = None
+    _cache_key = None
+    _stream_index = None  # chat index of the in-progress streamed reply
+
+    def invoke(self, context, event):
         props = context.scene.rm_props
         user_input = props.chat_input.strip()
-        
+
         if not user_input:
             self.report({'WARNING'}, "Please enter a message")
             return {'CANCELLED'}
-        
-        try:
-            # Add user message
-            user_msg = props.chat_messages.add()
-            user_msg.role = 'USER'
-            user_msg.content = user_input
-            user_msg.timestamp = datetime.now().strftime("%H:%M")
-            
-            # Clear input
-            props.chat_input = ""
-            
-            # Set thinking state
-            props.is_thinking = True
-            
-            # Get AI response (now returns code and message)
-            code, ai_message, error = model_interface.generate_blender_code(user_input)
-            
-            if error:
-                # Add error message
-                error_msg = props.chat_messages.add()
-                error_msg.role = 'AI'
-                error_msg.content = f"Sorry, I encountered an error: {error}"
-                error_msg.timestamp = datetime.now().strftime("%H:%M")
-                error_msg.status = 'ERROR'
-                error_msg.error_msg = error
-                props.is_thinking = False
-                self.report({'ERROR'}, error)
-                return {'CANCELLED'}
-            
-            # Add AI response with conversational message
-            ai_msg = props.chat_messages.add()
-            ai_msg.role = 'AI'
-            ai_msg.content = ai_message  # Use the AI's actual message
-            ai_msg.code = code
-            ai_msg.timestamp = datetime.now().strftime("%H:%M")
-            ai_msg.status = 'NONE'
-            
-            # Auto-execute if enabled
-            if props.auto_execute:
-                try:
-                    blender_utils.exec_script_in_current_scene(code)
-                    ai_msg.status = 'SUCCESS'
-                    self.report({'INFO'}, "Code generated and executed successfully")
-                except Exception as e:
-                    ai_msg.status = 'ERROR'
-                    ai_msg.error_msg = str(e)
-                    self.report({'WARNING'}, f"Execution failed: {str(e)}")
-            else:
-                self.report({'INFO'}, "Response generated. Click 'Run' to execute.")
-            
+
+        # A bare quick-action prefix carries no request - don't spend a
+        # model round-trip on it
+        if user_input in _QUICK_TEMPLATE_SET:
+            self.report({'WARNING'}, "Please complete the prompt")
+            return {'CANCELLED'}
+
+        # One strftime per send - reused for every message this turn
+        ts = datetime.now().strftime("%H:%M")
+
+        # Add user message
+        user_msg = props.chat_messages.add()
+        user_msg.role = blender_utils.ROLE_USER
+        user_msg.content = user_input
+        user_msg.timestamp = ts
+        blender_utils.bump_chat_version()
+
+        # Clear input
+        props.chat_input = ""
+
+        # Set thinking state
+        props.is_thinking = True
+
+        # Check the response cache before paying for an AI call
+        self._cache_key = response_cache.make_key(
+            props.provider, props.model_name, props.temperature, user_input)
+        cached = response_cache.lookup(self._cache_key) if props.cache_mode != 'OFF' else None
+
+        if cached is not None:
+            code, ai_message = cached
+            # No API call was made - don't let the message pick up the
+            # previous request's prompt-cache stats
+            model_interface.last_cache_info = ""
+            self._add_ai_message(context, code, ai_message, ts)
             props.is_thinking = False
-            
+            return {'FINISHED'}
+
+        # Run the model call on a worker thread and poll it from a timer
+        # so the UI stays responsive during inference; the response is
+        # streamed so the reply appears as it is generated. Settings
+        # are snapshotted here - the worker must not read bpy.context.
+        settings = model_interface.resolve_generation_settings()
+        self._stream_index = None
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        threading.Thread(
+            target=self._worker,
+            args=(user_input, settings, self._queue, self._cancel),
+            daemon=True
+        ).start()
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return self.invoke(context, None)
+
+    @staticmethod
+    def _worker(user_input, settings, out_queue, cancel):
+        def on_delta(text):
+            if not cancel.is_set():
+                out_queue.put(('delta', text))
+
+        try:
+            result = model_interface.generate_blender_code(
+                user_input, on_delta=on_delta, settings=settings)
         except Exception as e:
+            logger.exception("model call failed")
+            result = (None, None, str(e))
+        if not cancel.is_set():
+            out_queue.put(('done', result))
+
+    def modal(self, context, event):
+        props = context.scene.rm_props
+
+        if event.type == 'ESC':
+            self._cancel.set()
+            self._cleanup(context)
             props.is_thinking = False
-            traceback.print_exc()
-            
-            # Add error message
-            error_msg = props.chat_messages.add()
-            error_msg.role = 'SYSTEM'
-            error_msg.content = f"Error: {str(e)}"
-            error_msg.timestamp = datetime.now().strftime("%H:%M")
-            error_msg.status = 'ERROR'
-            
-            self.report({'ERROR'}, str(e))
+            self.report({'INFO'}, "Request cancelled")
             return {'CANCELLED'}
-        
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Drain everything queued since the last tick; deltas update the
+        # placeholder message in place, 'done' finalizes it
+        result = None
+        while result is None:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'delta':
+                self._show_stream_text(context, payload)
+            else:
+                result = payload
+
+        if result is None:
+            return {'RUNNING_MODAL'}
+        code, ai_message, error = result
+
+        self._cleanup(context)
+        props.is_thinking = False
+        ts = datetime.now().strftime("%H:%M")
+
+        if error:
+            # Add error message (reusing the streamed placeholder if any)
+            if self._stream_index is not None:
+                error_msg = props.chat_messages[self._stream_index]
+            else:
+                error_msg = props.chat_messages.add()
+            error_msg.role = blender_utils.ROLE_AI
+            error_msg.content = f"Sorry, I encountered an error: {error}"
+            error_msg.timestamp = ts
+            error_msg.status = blender_utils.STATUS_ERROR
+            error_msg.error_msg = error
+            blender_utils.bump_chat_version()
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        if props.cache_mode == 'ON':
+            response_cache.store(self._cache_key, code, ai_message)
+
+        self._add_ai_message(context, code, ai_message, ts)
         return {'FINISHED'}
 
+    def cancel(self, context):
+        if self._cancel is not None:
+            self._cancel.set()
+        self._cleanup(context)
+        context.scene.rm_props.is_thinking = False
+
+    def _cleanup(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+
+    def _show_stream_text(self, context, text):
+        """Mirror the accumulated streamed reply into a placeholder chat
+        message so the user watches it arrive"""
+        props = context.scene.rm_props
+        if self._stream_index is None:
+            msg = props.chat_messages.add()
+            msg.role = blender_utils.ROLE_AI
+            msg.timestamp = datetime.now().strftime("%H:%M")
+            msg.status = blender_utils.STATUS_THINKING
+            self._stream_index = len(props.chat_messages) - 1
+        else:
+            msg = props.chat_messages[self._stream_index]
+        msg.content = '\n'.join(
+            itertools.islice(text.splitlines(), _MAX_CONTENT_LINES))
+        blender_utils.bump_chat_version()
+        if context.area is not None:
+            context.area.tag_redraw()
+
+    def _add_ai_message(self, context, code, ai_message, ts):
+        """Append the AI response and auto-execute on the main thread
+        (finalizing the streamed placeholder when one exists)"""
+        props = context.scene.rm_props
+
+        if self._stream_index is not None:
+            ai_msg = props.chat_messages[self._stream_index]
+        else:
+            ai_msg = props.chat_messages.add()
+        ai_msg.role = blender_utils.ROLE_AI
+        ai_msg.content = '\n'.join(
+            itertools.islice(ai_message.splitlines(), _MAX_CONTENT_LINES))
+        ai_msg.code = code
+        ai_msg.timestamp = ts
+        ai_msg.status = blender_utils.STATUS_NONE
+        ai_msg.cache_info = model_interface.last_cache_info
+
+        # Auto-execute if enabled (must stay on the main thread)
+        if props.auto_execute:
+            try:
+                blender_utils.exec_script_in_current_scene(code)
+                ai_msg.status = blender_utils.STATUS_SUCCESS
+                self.report({'INFO'}, "Code generated and executed successfully")
+            except Exception as e:
+                ai_msg.status = blender_utils.STATUS_ERROR
+                ai_msg.error_msg = str(e)
+                self.report({'WARNING'}, f"Execution failed: {str(e)}")
+        else:
+            self.report({'INFO'}, "Response generated. Click 'Run' to execute.")
+        blender_utils.bump_chat_version()
+
 
 class RM_OT_ClearChat(bpy.types.Operator):
     """Clear all chat messages"""
@@ -96,6 +247,7 @@ class RM_OT_ClearChat(bpy.types.Operator):
     def execute(self, context):
         props = context.scene.rm_props
         props.chat_messages.clear()
+        blender_utils.bump_chat_version()
         self.report({'INFO'}, "Chat cleared")
         return {'FINISHED'}
 
@@ -109,28 +261,33 @@ class RM_OT_RunMessageCode(bpy.types.Operator):
     message_index: bpy.props.IntProperty()
     
     def execute(self, context):
-        props = context.scene.rm_props
+        # Bind the collection once - each RNA attribute hop walks a
+        # descriptor chain in C, so avoid repeating the full path
+        msgs = context.scene.rm_props.chat_messages
         
-        if self.message_index >= len(props.chat_messages):
+        if self.message_index >= len(msgs):
             self.report({'ERROR'}, "Invalid message index")
             return {'CANCELLED'}
         
-        msg = props.chat_messages[self.message_index]
+        msg = msgs[self.message_index]
         
         if not msg.code:
             self.report({'WARNING'}, "No code to execute")
             return {'CANCELLED'}
         
         try:
-            blender_utils.validate_script(msg.code)
-            exec(msg.code, globals())
-            msg.status = 'SUCCESS'
+            # Disk-backed cached compile (validates too); fresh namespace
+            # keeps runs from leaking names into module globals
+            exec(compile_cache.load_or_compile(msg.code), {"bpy": bpy, "__name__": "rendermind_exec"})
+            msg.status = blender_utils.STATUS_SUCCESS
             msg.error_msg = ""
+            blender_utils.bump_chat_version()
             self.report({'INFO'}, "Code executed successfully")
         except Exception as e:
-            traceback.print_exc()
-            msg.status = 'ERROR'
+            logger.exception("message code execution failed")
+            msg.status = blender_utils.STATUS_ERROR
             msg.error_msg = str(e)
+            blender_utils.bump_chat_version()
             self.report({'ERROR'}, f"Execution failed: {str(e)}")
             return {'CANCELLED'}
         
@@ -146,13 +303,13 @@ class RM_OT_CopyMessageCode(bpy.types.Operator):
     message_index: bpy.props.IntProperty()
     
     def execute(self, context):
-        props = context.scene.rm_props
+        msgs = context.scene.rm_props.chat_messages
         
-        if self.message_index >= len(props.chat_messages):
+        if self.message_index >= len(msgs):
             self.report({'ERROR'}, "Invalid message index")
             return {'CANCELLED'}
         
-        msg = props.chat_messages[self.message_index]
+        msg = msgs[self.message_index]
         
         if not msg.code:
             self.report({'WARNING'}, "No code to copy")
@@ -163,6 +320,18 @@ class RM_OT_CopyMessageCode(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class RM_OT_ReloadEnv(bpy.types.Operator):
+    """Re-read the .env file after editing it"""
+    bl_idname = "rm.reload_env"
+    bl_label = "Reload .env"
+    bl_description = "Re-read API key and model settings from the .env file"
+
+    def execute(self, context):
+        model_interface._clear_env_cache()
+        self.report({'INFO'}, ".env settings reloaded")
+        return {'FINISHED'}
+
+
 class RM_OT_QuickAction(bpy.types.Operator):
     """Quick action templates for common tasks"""
     bl_idname = "rm.quick_action"
@@ -174,26 +343,60 @@ class RM_OT_QuickAction(bpy.types.Operator):
     def execute(self, context):
         props = context.scene.rm_props
         
-        templates = {
-            'CREATE': "Create a ",
-            'MODIFY': "Modify the selected object to ",
-            'MATERIAL': "Add a material that "
-        }
-        
-        if self.action in templates:
-            props.chat_input = templates[self.action]
+        if self.action in _QUICK_TEMPLATES:
+            props.chat_input = _QUICK_TEMPLATES[self.action]
         
         return {'FINISHED'}
 
 
 # ---- Legacy Operators (kept for compatibility) ----
 
+def _apply_preview_settings(scene):
+    """Drop a preview scene to thumbnail quality - render time scales
+    roughly linearly with sample count, and thumbnails don't need the
+    final-quality samples the user's scene is configured with"""
+    scene.render.resolution_percentage = 25
+    if scene.render.engine == 'CYCLES':
+        scene.cycles.samples = 16
+    else:
+        scene.eevee.taa_render_samples = 8
+
+
+def _preview_scene():
+    """Get-or-create the shared preview scene. Scene creation/removal
+    triggers a depsgraph rebuild each time, so one scene is reused for
+    every preview and only its objects are cleared between runs"""
+    scene = bpy.data.scenes.get("rm_preview_shared")
+    if scene is None:
+        scene = bpy.data.scenes.new("rm_preview_shared")
+    _apply_preview_settings(scene)
+    return scene
+
+
+def _clear_preview_scene(scene):
+    """Empty the shared preview scene in one C-level pass. batch_remove
+    drops all objects without a per-object Python loop; the orphan purge
+    then sweeps the mesh/material data they leave behind so reusing the
+    scene doesn't accumulate datablocks across variants"""
+    ids = tuple(scene.objects)
+    if ids:
+        bpy.data.batch_remove(ids=ids)
+        bpy.ops.outliner.orphans_purge(do_local_ids=True, do_recursive=True)
+
 class RM_OT_Generate(bpy.types.Operator):
     bl_idname = "rm.generate_plan"
     bl_label = "Generate Plan"
     bl_description = "Generate plan(s) for the current prompt and create previews"
 
-    def execute(self, context):
+    _timer = None
+    _pending = None      # deque of (variant_index, plan) awaiting render
+    _current = None      # (variant_index, tmp_scene, thumb_path) in flight
+    _render_done = False
+    _prev_scene = None
+
+    def invoke(self, context, event):
+        from collections import deque
+
         scn = context.scene
         props = scn.rm_props
         prompt = props.prompt_text
@@ -209,47 +412,110 @@ class RM_OT_Generate(bpy.types.Operator):
             # variants
             props.variants.clear()
             variants = model_interface.generate_variants(prompt, n=props.preview_count)
-            for i, pv in enumerate(variants):
-                v = props.variants.add()
-                v.name = f"Variant {i+1}"
-                v.plan = pv
-                # try to render a thumbnail in a temporary scene
-                try:
-                    tmp_scene = bpy.data.scenes.new(f"rm_preview_tmp_{i}")
-                    bpy.context.window.scene = tmp_scene
-                    # clear any default objects
-                    for ob in list(tmp_scene.objects):
-                        try:
-                            bpy.data.objects.remove(ob, do_unlink=True)
-                        except Exception:
-                            pass
-                    # emit script and run
-                    script = plan_emitter.emitter_plan_to_script(pv)
-                    blender_utils.validate_script(script)
-                    # execute script in tmp_scene (note: script uses bpy.ops -> acts on tmp_scene)
-                    exec(script, globals())
-                    # render thumbnail
-                    thumb = blender_utils.temp_thumbnail_path(f"rm_variant_{i}.png")
-                    tmp_scene.render.filepath = thumb
-                    bpy.ops.render.render(write_still=True, scene=tmp_scene.name)
-                    v.thumb_path = thumb
-                except Exception as e:
-                    v.thumb_path = ""
-                    print("Preview generation failed:", e)
-                    traceback.print_exc()
-                finally:
-                    # remove the tmp scene if it exists
-                    try:
-                        bpy.data.scenes.remove(tmp_scene)
-                    except Exception:
-                        pass
-
-            self.report({'INFO'}, "Plans and previews generated")
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("plan generation failed")
             self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        # Queue the variant renders; each render runs non-blocking via
+        # INVOKE_DEFAULT and the render_complete handler advances the queue
+        self._pending = deque()
+        for i, pv in enumerate(variants):
+            v = props.variants.add()
+            v.name = f"Variant {i+1}"
+            v.plan = pv
+            self._pending.append((i, pv))
+
+        self._prev_scene = context.window.scene
+        bpy.app.handlers.render_complete.append(self._on_render_done)
+        bpy.app.handlers.render_cancel.append(self._on_render_done)
+
+        if not self._start_next(context):
+            self._finish(context)
+            self.report({'INFO'}, "Plans generated (no previews rendered)")
+            return {'FINISHED'}
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.2, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return self.invoke(context, None)
+
+    def _on_render_done(self, *args):
+        # Called from render_complete/render_cancel; just flag the modal
+        # timer tick to collect the result on the main thread
+        self._render_done = True
+
+    def _start_next(self, context):
+        """Build the next variant's tmp scene and launch its render.
+        Returns False once the queue is empty."""
+        while self._pending:
+            i, pv = self._pending.popleft()
+            try:
+                tmp_scene = _preview_scene()
+                context.window.scene = tmp_scene
+                _clear_preview_scene(tmp_scene)
+                # emit + run (memoized per plan text); script uses
+                # bpy.ops so it acts on the active tmp_scene
+                plan_emitter.run_plan(pv)
+                # render thumbnail without blocking the UI
+                thumb = blender_utils.temp_thumbnail_path(f"rm_variant_{i}.png")
+                tmp_scene.render.filepath = thumb
+                self._current = (i, thumb)
+                self._render_done = False
+                result = bpy.ops.render.render('INVOKE_DEFAULT', write_still=True)
+                # A refused render job (e.g. another render already in
+                # flight) returns CANCELLED without raising and fires
+                # neither handler - waiting on it would spin forever
+                if 'RUNNING_MODAL' not in result and 'FINISHED' not in result:
+                    logger.warning("render refused for variant %d: %s", i, result)
+                    self._current = None
+                    continue
+                return True
+            except Exception:
+                logger.exception("preview generation failed")
+        return False
+
+    def modal(self, context, event):
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        if not self._render_done:
+            return {'RUNNING_MODAL'}
+
+        # Current render finished - record the thumbnail; the shared
+        # preview scene is kept alive and cleared by the next variant
+        i, thumb = self._current
+        props = self._prev_scene.rm_props
+        if i < len(props.variants):
+            props.variants[i].thumb_path = thumb
+        self._current = None
+
+        if self._start_next(context):
+            return {'RUNNING_MODAL'}
+
+        self._finish(context)
+        self.report({'INFO'}, "Plans and previews generated")
         return {'FINISHED'}
 
+    def cancel(self, context):
+        self._finish(context)
+
+    def _finish(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        for handler_list in (bpy.app.handlers.render_complete,
+                             bpy.app.handlers.render_cancel):
+            if self._on_render_done in handler_list:
+                handler_list.remove(self._on_render_done)
+        if self._prev_scene is not None:
+            try:
+                context.window.scene = self._prev_scene
+            except Exception:
+                pass
+
 
 class RM_OT_Preview(bpy.types.Operator):
     bl_idname = "rm.preview_plan"
@@ -261,16 +527,10 @@ class RM_OT_Preview(bpy.types.Operator):
         props = scn.rm_props
         plan = props.plan_text
         try:
-            tmp_scene = bpy.data.scenes.new("rm_preview_exec")
+            tmp_scene = _preview_scene()
             bpy.context.window.scene = tmp_scene
-            for ob in list(tmp_scene.objects):
-                try:
-                    bpy.data.objects.remove(ob, do_unlink=True)
-                except Exception:
-                    pass
-            script = plan_emitter.emitter_plan_to_script(plan)
-            blender_utils.validate_script(script)
-            exec(script, globals())
+            _clear_preview_scene(tmp_scene)
+            plan_emitter.run_plan(plan)
             # render
             thumb = blender_utils.temp_thumbnail_path("rm_preview_exec.png")
             tmp_scene.render.filepath = thumb
@@ -284,14 +544,11 @@ class RM_OT_Preview(bpy.types.Operator):
                         break
             except Exception:
                 pass
-            # cleanup
-            try:
-                bpy.data.scenes.remove(tmp_scene)
-            except Exception:
-                pass
+            # restore the user's scene; the shared preview scene stays
+            bpy.context.window.scene = scn
             self.report({'INFO'}, f"Preview rendered: {thumb}")
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("preview failed")
             self.report({'ERROR'}, str(e))
         return {'FINISHED'}
 
@@ -306,16 +563,14 @@ class RM_OT_Apply(bpy.types.Operator):
         props = scn.rm_props
         plan = props.plan_text
         try:
-            script = plan_emitter.emitter_plan_to_script(plan)
-            blender_utils.validate_script(script)
             # execute in current scene (commits)
-            exec(script, globals())
+            plan_emitter.run_plan(plan)
             # mark latest history as accepted
             if len(props.history) > 0:
                 props.history[-1].accepted = True
             self.report({'INFO'}, "Plan applied to scene")
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("plan apply failed")
             self.report({'ERROR'}, str(e))
         return {'FINISHED'}
 
@@ -326,6 +581,7 @@ classes = (
     RM_OT_ClearChat,
     RM_OT_RunMessageCode,
     RM_OT_CopyMessageCode,
+    RM_OT_ReloadEnv,
     RM_OT_QuickAction,
     RM_OT_Generate,
     RM_OT_Preview,
@@ -4,57 +4,100 @@ Keep templates canonical so model outputs small DSL and emitter produces stable
 Extend templates to add more operations.
 """
 
+import re
+from functools import lru_cache
+
+
 def register():
     pass
 
+
 def unregister():
     pass
 
+
+_HEADER = "\n".join([
+    "def rendermind_action(context: dict) -> None:",
+    "    import bpy",
+    ""
+])
+
+# Pre-joined script bodies - built once at import, filled via str.format
+_TEMPLATE_SPHERE = "\n".join([
+    "    bpy.ops.mesh.primitive_uv_sphere_add(radius={radius}, location={loc})",
+    "    obj = bpy.context.active_object",
+    "    obj.name = 'rm_sphere'",
+    "    mat = bpy.data.materials.new('rm_mat')",
+    "    mat.use_nodes = True",
+    "    bsdf = mat.node_tree.nodes.get('Principled BSDF')",
+    "    if bsdf: bsdf.inputs['Base Color'].default_value=(0.8,0.2,0.2,1)",
+    "    obj.data.materials.append(mat)"
+])
+
+_TEMPLATE_CYLINDER = "\n".join([
+    "    bpy.ops.mesh.primitive_cylinder_add(radius=0.25, depth=0.6, location=(0,1,0.3))",
+    "    obj = bpy.context.active_object",
+    "    obj.name = 'rm_cylinder'",
+    "    mat = bpy.data.materials.new('rm_ceramic')",
+    "    mat.use_nodes = True",
+    "    bsdf = mat.node_tree.nodes.get('Principled BSDF')",
+    "    if bsdf: bsdf.inputs['Roughness'].default_value = 0.15",
+    "    obj.data.materials.append(mat)"
+])
+
+_TEMPLATE_FALLBACK = "\n".join([
+    "    # Plan not implemented in emitter placeholder",
+    "    print('Plan not implemented')"
+])
+
+# One compiled scan collects template keywords and the optional radius in
+# a single pass over the plan, replacing the chain of lower()/in checks
+_PATTERN = re.compile(r"uv_sphere|sphere|cylinder|vase|r=([\d.]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
 def emitter_plan_to_script(plan: str) -> str:
     """
     Very small DSL parser and template filler.
     Expects plan to contain keywords like 'uv_sphere', 'cylinder', 'vase', etc.
     Returns Python source with a single function: rendermind_action(context)
     """
-    lines = [
-        "def rendermind_action(context: dict) -> None:",
-        "    import bpy"
-    ]
-    p = plan.lower()
-    # Sphere template
-    if "uv_sphere" in p or "sphere" in p:
-        # attempt to parse radius and location (simple heuristics)
-        r = 0.5
-        loc = "(0,0,0.5)"
-        if "r=" in p:
+    keywords = set()
+    radius = 0.5
+    for m in _PATTERN.finditer(plan):
+        if m.group(1):
             try:
-                # crude parse
-                ii = p.index("r=") + 2
-                r = float(p[ii:].split(",")[0].split()[0].strip(");"))
-            except Exception:
+                radius = float(m.group(1))
+            except ValueError:
                 pass
-        lines += [
-            f"    bpy.ops.mesh.primitive_uv_sphere_add(radius={r}, location={loc})",
-            "    obj = bpy.context.active_object",
-            "    obj.name = 'rm_sphere'",
-            "    mat = bpy.data.materials.new('rm_mat')",
-            "    mat.use_nodes = True",
-            "    bsdf = mat.node_tree.nodes.get('Principled BSDF')",
-            "    if bsdf: bsdf.inputs['Base Color'].default_value=(0.8,0.2,0.2,1)",
-            "    obj.data.materials.append(mat)"
-        ]
-    # Cylinder / vase template
-    elif "cylinder" in p:
-        lines += [
-            "    bpy.ops.mesh.primitive_cylinder_add(radius=0.25, depth=0.6, location=(0,1,0.3))",
-            "    obj = bpy.context.active_object",
-            "    obj.name = 'rm_cylinder'",
-            "    mat = bpy.data.materials.new('rm_ceramic')",
-            "    mat.use_nodes = True",
-            "    bsdf = mat.node_tree.nodes.get('Principled BSDF')",
-            "    if bsdf: bsdf.inputs['Roughness'].default_value = 0.15",
-            "    obj.data.materials.append(mat)"
-        ]
-    else:
-        lines += ["    # Plan not implemented in emitter placeholder", "    print('Plan not implemented')"]
-    return "\n".join(lines)
+        else:
+            keywords.add(m.group(0).lower())
+
+    if 'uv_sphere' in keywords or 'sphere' in keywords:
+        return _HEADER + _TEMPLATE_SPHERE.format(radius=radius, loc="(0,0,0.5)")
+    if 'cylinder' in keywords or 'vase' in keywords:
+        return _HEADER + _TEMPLATE_CYLINDER
+    return _HEADER + _TEMPLATE_FALLBACK
+
+
+@lru_cache(maxsize=128)
+def validated_plan_script(plan: str) -> str:
+    """Emit the script for a plan and validate it, memoized by plan text
+    so near-duplicate variants skip regeneration and revalidation"""
+    from . import blender_utils
+    script = emitter_plan_to_script(plan)
+    blender_utils.validate_script(script)
+    return script
+
+
+def run_plan(plan: str) -> None:
+    """Emit, validate, compile and execute a plan in a fresh namespace.
+
+    Single entry point for the Generate/Preview/Apply operators - every
+    step is memoized (emit and validation per plan, compile per script),
+    so repeated runs of the same plan only pay the exec.
+    """
+    import bpy
+    from . import compile_cache
+    script = validated_plan_script(plan)
+    exec(compile_cache.load_or_compile(script), {"bpy": bpy, "__name__": "rendermind_exec"})
@@ -0,0 +1,44 @@
+"""
+Response Cache - In-memory LRU cache for AI responses
+Repeated prompts (e.g. Quick Action templates) skip the model round-trip
+entirely; entries expire after a TTL and evict least-recently-used
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 256
+TTL_SECONDS = 7 * 24 * 3600  # 1 week
+
+_cache = OrderedDict()  # key -> (stored_at, code, message)
+
+
+def make_key(provider, model_name, temperature, prompt):
+    """Cache key over everything that changes the model's answer"""
+    raw = f"{provider}|{model_name}|{temperature}|{prompt}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def lookup(key):
+    """Return (code, message) on a hit, None if missing or expired"""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    stored_at, code, message = entry
+    if time.time() - stored_at > TTL_SECONDS:
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return code, message
+
+
+def store(key, code, message):
+    _cache[key] = (time.time(), code, message)
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def clear():
+    _cache.clear()
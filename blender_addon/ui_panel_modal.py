@@ -2,6 +2,35 @@ import bpy
 from bpy.types import Operator, Panel
 from . import blender_utils
 
+# Probe for websockets once at import time - the sidebar panel redraws
+# every frame and raising/catching ImportError per redraw is pure waste
+try:
+    import websockets  # noqa: F401
+    _HAS_WEBSOCKETS = True
+except ImportError:
+    _HAS_WEBSOCKETS = False
+
+# Draw-time cache of split message lines, keyed by each message's RNA
+# pointer. Panel draw runs every redraw, so splitting content/code per
+# message per frame is O(chat length) string work - split once instead.
+_line_cache = {}
+
+
+def _msg_lines(msg):
+    """Return (content_lines, code_lines) for a message, split once"""
+    key = msg.as_pointer()
+    content, code = msg.content, msg.code
+    entry = _line_cache.get(key)
+    if entry is not None and entry[0] == content and entry[1] == code:
+        return entry[2], entry[3]
+    if len(_line_cache) > 256:
+        _line_cache.clear()
+    content_lines = content.split('\n')[:8]
+    code_lines = code.split('\n')[:12]
+    _line_cache[key] = (content, code, content_lines, code_lines)
+    return content_lines, code_lines
+
+
 # ---- Modal Chat Window Operator ----
 class RM_OT_OpenChatWindow(Operator):
     """Open RenderMind Chat Window"""
@@ -38,30 +67,32 @@ class RM_OT_OpenChatWindow(Operator):
         col = chat_box.column(align=True)
         col.scale_y = 0.9
         
-        if len(props.chat_messages) == 0:
+        msgs = props.chat_messages
+        if len(msgs) == 0:
             empty_box = col.box()
             empty_box.label(text="👋 Hi! I'm RenderMind, your AI assistant for Blender.", icon='INFO')
             empty_box.label(text="Tell me what you want to create and I'll generate the code!")
         else:
             # Display messages
-            for msg in props.chat_messages:
+            for msg in msgs:
                 msg_box = col.box()
-                
+                content_lines, code_lines = _msg_lines(msg)
+
                 # Message header
                 header = msg_box.row()
-                if msg.role == 'USER':
+                if msg.role == blender_utils.ROLE_USER:
                     header.label(text="You", icon='USER')
                 else:
                     header.label(text="RenderMind AI", icon='LIGHT_SUN')
                 header.label(text=msg.timestamp)
-                
+
                 # Message content
                 content_col = msg_box.column(align=True)
-                for line in msg.content.split('\n')[:8]:
+                for line in content_lines:
                     content_col.label(text=line)
                 
                 # Code block if available
-                if msg.code and msg.role == 'AI':
+                if msg.code and msg.role == blender_utils.ROLE_AI:
                     code_row = msg_box.row(align=True)
                     code_row.prop(msg, "show_code", 
                         icon='TRIA_DOWN' if msg.show_code else 'TRIA_RIGHT',
@@ -69,7 +100,6 @@ class RM_OT_OpenChatWindow(Operator):
                     
                     if msg.show_code:
                         code_box = msg_box.box()
-                        code_lines = msg.code.split('\n')[:12]
                         for line in code_lines:
                             code_box.label(text=line, icon='BLANK1')
                     
@@ -79,9 +109,9 @@ class RM_OT_OpenChatWindow(Operator):
                     actions.operator("rm.copy_message_code", text="Copy", icon='COPYDOWN')
                 
                 # Status
-                if msg.status == 'SUCCESS':
+                if msg.status == blender_utils.STATUS_SUCCESS:
                     msg_box.label(text="✓ Executed successfully", icon='CHECKMARK')
-                elif msg.status == 'ERROR':
+                elif msg.status == blender_utils.STATUS_ERROR:
                     error_box = msg_box.box()
                     error_box.alert = True
                     error_box.label(text=f"✗ Error: {msg.error_msg}", icon='ERROR')
@@ -95,15 +125,17 @@ class RM_OT_OpenChatWindow(Operator):
         # Text input
         input_box.prop(props, "chat_input", text="")
         
-        # Character counter
+        # Character counter (one RNA string fetch for both counter and
+        # send-enabled check)
+        chat_input = props.chat_input
         char_row = input_box.row()
         char_row.scale_y = 0.7
-        char_row.label(text=f"{len(props.chat_input)} / 4096 chars")
+        char_row.label(text=f"{len(chat_input)} / 4096 chars")
         
         # Send button
         send_row = input_box.row()
         send_row.scale_y = 1.3
-        send_row.enabled = len(props.chat_input.strip()) > 0
+        send_row.enabled = len(chat_input.strip()) > 0
         send_op = send_row.operator("rm.send_message", text="Send Message", icon='PLAY')
         
         # Quick actions
@@ -171,26 +203,29 @@ class RM_PT_SimpleLauncher(Panel):
         layout.separator()
         
         # Web UI section (if websockets available)
-        try:
+        if _HAS_WEBSOCKETS:
             web_box = layout.box()
             web_box.label(text="Web Interface:", icon='URL')
             web_col = web_box.column(align=True)
             web_col.operator("rm.start_web_server", text="Start Web Server", icon='PLAY')
             web_col.operator("rm.stop_web_server", text="Stop Web Server", icon='PAUSE')
             web_col.operator("rm.open_web_ui", text="Open Web UI", icon='URL')
-        except:
-            pass
         
         layout.separator()
         
         # Quick stats
+        msgs = props.chat_messages
         stats_box = layout.box()
         stats_box.label(text="Session Stats:", icon='INFO')
-        stats_box.label(text=f"Messages: {len(props.chat_messages)}")
+        stats_box.label(text=f"Messages: {len(msgs)}")
         
         # Display provider with custom name
         provider_name = "RenderMind AI" if props.provider == 'OPENAI' else props.provider
         stats_box.label(text=f"Provider: {provider_name}")
+
+        # Prompt-cache hit ratio of the latest AI reply, if known
+        if len(msgs) and msgs[-1].cache_info:
+            stats_box.label(text=f"Cache: {msgs[-1].cache_info}")
         
         # Quick actions
         layout.separator()
@@ -222,6 +257,7 @@ class RM_PT_SimpleLauncher(Panel):
                 if env_key:
                     info_box = col.box()
                     info_box.label(text="✓ RenderMind API Key loaded", icon='CHECKMARK')
+                    info_box.operator("rm.reload_env", text="Reload .env", icon='FILE_REFRESH')
                 else:
                     col.prop(props, "openai_api_key", text="API Key")
                     if not props.openai_api_key:
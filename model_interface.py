@@ -6,6 +6,7 @@ Supports OpenAI API and will support local models
 import bpy
 import json
 import os
+import re
 from pathlib import Path
 
 try:
@@ -16,22 +17,150 @@ except ImportError:
     print("RenderMind: 'requests' library not found. API features will be limited.")
 
 
+# Fixed system preamble, kept bit-identical and first in every request so
+# the provider's automatic prompt-prefix caching can reuse its encoding
+# (volatile content like scene context is appended after it)
+SYSTEM_PROMPT = """You are an expert Blender Python scripting assistant. Generate clean, executable Python code for Blender.
+
+IMPORTANT RULES:
+1. Always wrap your code in a function called `rendermind_action(context)`
+2. Import bpy at the top
+3. Use bpy.ops and bpy.data APIs correctly
+4. Include error handling where appropriate
+5. Add brief comments to explain complex operations
+6. Respond with a friendly message followed by the code in a code block
+
+Example response:
+"I'll create a cube for you! Here's the code:
+
+```python
+import bpy
+
+def rendermind_action(context):
+    # Create a cube
+    bpy.ops.mesh.primitive_cube_add(size=2, location=(0, 0, 1))
+```
+"
+
+Be conversational and helpful!"""
+
+# Prompt-cache usage from the most recent API call, for the UI stats box
+last_cache_info = ""
+
+# Shared HTTP session - keep-alive reuse skips the TCP+TLS handshake on
+# every call after the first, and the adapter pool covers the parallel
+# variant fan-out. Built lazily so import stays cheap.
+_SESSION = None
+
+
+def _session():
+    global _SESSION
+    if _SESSION is None:
+        from requests.adapters import HTTPAdapter, Retry
+        _SESSION = requests.Session()
+        # POST is not in Retry's default allowed_methods, so transient
+        # 429/5xx on the completion endpoint would never retry without
+        # listing it; Retry-After from the provider is honored
+        _SESSION.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=5, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["POST"],
+                              respect_retry_after_header=True)
+        ))
+    return _SESSION
+
+
+# Semantic cache over generated code - exact repeats and close
+# paraphrases of earlier prompts skip the completion call entirely
+_SEMANTIC_CACHE = None
+
+
+def _semantic_cache():
+    global _SEMANTIC_CACHE
+    if _SEMANTIC_CACHE is None:
+        from .utils import cache
+        _SEMANTIC_CACHE = cache.SemanticCache()
+    return _SEMANTIC_CACHE
+
+
+# Small worker pool for overlapping cheap network prefetches (the
+# semantic-cache embedding) with local work
+_PREFETCH_POOL = None
+
+
+def _prefetch_pool():
+    global _PREFETCH_POOL
+    if _PREFETCH_POOL is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _PREFETCH_POOL = ThreadPoolExecutor(max_workers=2)
+    return _PREFETCH_POOL
+
+
+def _embed(text, api_key):
+    """Fetch an embedding for text, or None on any failure - the
+    semantic cache is an optimization, never a hard dependency.
+
+    api_key comes from the caller's settings snapshot: this runs on
+    _PREFETCH_POOL, where resolving the key would read bpy.context.
+    """
+    if not HAS_REQUESTS:
+        return None
+    if not api_key:
+        return None
+    try:
+        response = _session().post(
+            "https://api.openai.com/v1/embeddings",
+            headers={"Authorization": f"Bearer {api_key}",
+                     "Content-Type": "application/json"},
+            json={"model": "text-embedding-3-small", "input": text},
+            timeout=(3.05, 7)
+        )
+        if response.status_code == 200:
+            return response.json()['data'][0]['embedding']
+    except Exception:
+        pass
+    return None
+
+
+# Parsed .env keyed by file mtime - the sidebar panel and every API
+# call hit load_env_file, which would otherwise re-open and re-parse the
+# file each time. A stat per call is all that remains on the hot path,
+# and edits to the file are picked up automatically.
+_ENV_CACHE = {"mtime": None, "vars": {}}
+
+
 def load_env_file():
-    """Load environment variables from .env file"""
+    """Load environment variables from .env file (cached by mtime)"""
     env_path = Path(__file__).parent / ".env"
+    try:
+        mtime = env_path.stat().st_mtime
+    except OSError:
+        mtime = None
+
+    if mtime is not None and mtime == _ENV_CACHE["mtime"]:
+        return _ENV_CACHE["vars"]
+
     env_vars = {}
-    
-    if env_path.exists():
+    if mtime is not None:
         with open(env_path, 'r') as f:
             for line in f:
                 line = line.strip()
                 if line and not line.startswith('#') and '=' in line:
                     key, value = line.split('=', 1)
                     env_vars[key.strip()] = value.strip()
-    
+
+    _ENV_CACHE["mtime"] = mtime
+    _ENV_CACHE["vars"] = env_vars
     return env_vars
 
 
+def _clear_env_cache():
+    """Force the next load_env_file call to re-read the file"""
+    _ENV_CACHE["mtime"] = None
+
+
 def get_api_key():
     """Get RenderMind API key from .env file or scene properties"""
     # Try .env file first
@@ -68,12 +197,43 @@ def get_model_settings():
     return model, temperature
 
 
-def call_openai_api(messages, model="gpt-4o-mini", temperature=0.7):
-    """Call RenderMind AI API with messages"""
+def resolve_generation_settings():
+    """Snapshot provider/model/temperature/api_key from scene properties.
+
+    Must run on the main thread: worker threads (the chat operator's
+    worker, generate_variants' pool, the websocket generate pool) pass
+    the result into generate_blender_code instead of reading
+    bpy.context themselves, which is not safe off the main thread. The
+    API key is included because get_api_key falls back to the panel
+    property when .env has no key - the same unsafe RNA read.
+    """
+    model, temperature = get_model_settings()
+    props = bpy.context.scene.rm_props
+    return {
+        'provider': props.provider,
+        'model': model,
+        'temperature': temperature,
+        'api_key': get_api_key(),
+        'cache_mode': props.cache_mode,
+    }
+
+
+def call_openai_api(messages, model="gpt-4o-mini", temperature=0.7, n=1,
+                    api_key=None):
+    """Call RenderMind AI API with messages
+
+    With n > 1 a single request returns n sampled choices (one list of
+    contents) - the prompt is billed once instead of per variant.
+
+    Worker-thread callers must pass api_key (from the settings
+    snapshot); the get_api_key fallback reads bpy.context and is only
+    safe on the main thread.
+    """
     if not HAS_REQUESTS:
         return None, "Requests library not installed"
-    
-    api_key = get_api_key()
+
+    if api_key is None:
+        api_key = get_api_key()
     if not api_key:
         return None, "RenderMind API key not set. Please add it in the settings."
     
@@ -87,17 +247,28 @@ def call_openai_api(messages, model="gpt-4o-mini", temperature=0.7):
         "messages": messages,
         "temperature": temperature
     }
+    if n > 1:
+        data["n"] = n
     
     try:
-        response = requests.post(
+        response = _session().post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=data,
-            timeout=30
+            timeout=(3.05, 27)
         )
         
         if response.status_code == 200:
             result = response.json()
+            # Record how much of the prompt the provider served from its
+            # prefix cache so the UI can show the hit ratio
+            global last_cache_info
+            usage = result.get('usage', {})
+            prompt_tokens = usage.get('prompt_tokens', 0)
+            cached_tokens = usage.get('prompt_tokens_details', {}).get('cached_tokens', 0)
+            last_cache_info = f"{cached_tokens}/{prompt_tokens} prompt tokens cached" if prompt_tokens else ""
+            if n > 1:
+                return [c['message']['content'] for c in result['choices']], None
             return result['choices'][0]['message']['content'], None
         else:
             error = f"API Error {response.status_code}: {response.text}"
@@ -107,6 +278,60 @@ def call_openai_api(messages, model="gpt-4o-mini", temperature=0.7):
         return None, str(e)
 
 
+def call_openai_api_stream(messages, model="gpt-4o-mini", temperature=0.7,
+                           api_key=None):
+    """Yield content deltas from a streaming completion request.
+
+    Streaming makes time-to-first-token the user-visible latency instead
+    of time-to-last-token; the caller accumulates the deltas. Raises
+    RuntimeError on transport or API errors. Worker-thread callers must
+    pass api_key - see call_openai_api.
+    """
+    if not HAS_REQUESTS:
+        raise RuntimeError("Requests library not installed")
+
+    if api_key is None:
+        api_key = get_api_key()
+    if not api_key:
+        raise RuntimeError("RenderMind API key not set. Please add it in the settings.")
+
+    response = _session().post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}",
+                 "Content-Type": "application/json"},
+        json={
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        },
+        timeout=(3.05, 27),
+        stream=True
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"API Error {response.status_code}: {response.text}")
+
+    global last_cache_info
+    for line in response.iter_lines():
+        if not line or not line.startswith(b"data: "):
+            continue
+        payload = line[6:]
+        if payload == b"[DONE]":
+            break
+        chunk = json.loads(payload)
+        usage = chunk.get('usage')
+        if usage:
+            prompt_tokens = usage.get('prompt_tokens', 0)
+            cached_tokens = usage.get('prompt_tokens_details', {}).get('cached_tokens', 0)
+            last_cache_info = f"{cached_tokens}/{prompt_tokens} prompt tokens cached" if prompt_tokens else ""
+        choices = chunk.get('choices')
+        if choices:
+            delta = choices[0].get('delta', {}).get('content')
+            if delta:
+                yield delta
+
+
 def transcribe_audio(audio_file_path):
     """Transcribe audio using OpenAI Whisper API"""
     if not HAS_REQUESTS:
@@ -127,11 +352,11 @@ def transcribe_audio(audio_file_path):
                 'model': (None, 'whisper-1')  # Use actual Whisper model
             }
             
-            response = requests.post(
+            response = _session().post(
                 "https://api.openai.com/v1/audio/transcriptions",
                 headers=headers,
                 files=files,
-                timeout=30
+                timeout=(3.05, 27)
             )
         
         if response.status_code == 200:
@@ -145,14 +370,42 @@ def transcribe_audio(audio_file_path):
         return None, str(e)
 
 
-def generate_blender_code(prompt: str, context_meta: dict = None) -> tuple:
+def generate_blender_code(prompt: str, context_meta: dict = None, on_delta=None,
+                          settings: dict = None) -> tuple:
     """
     Generate Blender Python code from natural language prompt
     Returns: (code_string, ai_response_text, error_message)
+
+    When on_delta is given the API response is streamed and on_delta is
+    called with the accumulated text after each chunk, so the UI can
+    show the reply as it arrives.
+
+    settings is a resolve_generation_settings() snapshot; callers on
+    worker threads must supply it, since resolving it here reads
+    bpy.context and is only safe on the main thread.
     """
     from .blender_addon import model_library
-    
-    props = bpy.context.scene.rm_props
+
+    if settings is None:
+        settings = resolve_generation_settings()
+    provider = settings['provider']
+
+    # The stats describe this request only - library, demo and cached
+    # replies make no API call and must not inherit the previous ratio
+    global last_cache_info
+    last_cache_info = ""
+
+    # Prefetch the prompt embedding for the semantic cache while the
+    # library search runs - its network round-trip dominates the local
+    # token scan, so on a miss the cache lookup is already paid for.
+    # (A full completion prefetch would bill a wasted API call on every
+    # library hit, so only the near-free embedding is overlapped.)
+    # cache_mode gates the semantic tier like the exact one: OFF always
+    # calls the model, READ_ONLY uses hits without storing new entries.
+    cache_mode = settings.get('cache_mode', 'ON')
+    embed_future = None
+    if provider == 'OPENAI' and cache_mode != 'OFF':
+        embed_future = _prefetch_pool().submit(_embed, prompt, settings['api_key'])
     
     # Check if we have a matching model in the library
     # Only use if there's a strong match (score >= 60)
@@ -178,35 +431,11 @@ def generate_blender_code(prompt: str, context_meta: dict = None) -> tuple:
     print(f"[RenderMind] No match found, generating custom code")
     
     # No model found - generate code with AI
-    system_prompt = """You are an expert Blender Python scripting assistant. Generate clean, executable Python code for Blender.
-
-IMPORTANT RULES:
-1. Always wrap your code in a function called `rendermind_action(context)`
-2. Import bpy at the top
-3. Use bpy.ops and bpy.data APIs correctly
-4. Include error handling where appropriate
-5. Add brief comments to explain complex operations
-6. Respond with a friendly message followed by the code in a code block
-
-Example response:
-"I'll create a cube for you! Here's the code:
-
-```python
-import bpy
-
-def rendermind_action(context):
-    # Create a cube
-    bpy.ops.mesh.primitive_cube_add(size=2, location=(0, 0, 1))
-```
-"
-
-Be conversational and helpful!"""
-
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": f"Create Blender Python code for: {prompt}"}
     ]
-    
+
     # Add context if available
     if context_meta:
         messages.append({
@@ -214,32 +443,41 @@ Be conversational and helpful!"""
             "content": f"Current scene context: {json.dumps(context_meta)}"
         })
     
-    if props.provider == 'OPENAI':
-        model, temperature = get_model_settings()
-        full_response, error = call_openai_api(messages, model, temperature)
-        if error:
-            return None, None, error
-        
-        # Extract conversational message and code
-        ai_message = full_response
-        code = full_response
-        
-        # Extract code from markdown if present
-        if "```python" in code:
-            code = code.split("```python")[1].split("```")[0].strip()
-            # Get the text before the code block as the message
-            ai_message = full_response.split("```python")[0].strip()
-        elif "```" in code:
-            code = code.split("```")[1].split("```")[0].strip()
-            ai_message = full_response.split("```")[0].strip()
-        
-        # If no message before code, create a friendly one
-        if not ai_message or ai_message == full_response:
-            ai_message = "I've generated the code for you! ✨"
+    if provider == 'OPENAI':
+        # Semantic cache: an embedding call is ~100x cheaper than a
+        # completion, and near-duplicate prompts are common while a
+        # user iterates on a scene
+        model, temperature = settings['model'], settings['temperature']
+        embedding = embed_future.result() if embed_future is not None else None
+        if cache_mode != 'OFF':
+            hit = _semantic_cache().lookup(prompt, model, temperature, embedding)
+            if hit is not None:
+                return hit[0], hit[1], None
+
+        api_key = settings['api_key']
+        if on_delta is not None:
+            try:
+                parts = []
+                for delta in call_openai_api_stream(messages, model, temperature,
+                                                    api_key=api_key):
+                    parts.append(delta)
+                    on_delta(''.join(parts))
+                full_response = ''.join(parts)
+            except Exception as e:
+                return None, None, str(e)
+        else:
+            full_response, error = call_openai_api(messages, model, temperature,
+                                                   api_key=api_key)
+            if error:
+                return None, None, error
         
+        code, ai_message = extract_code_and_message(full_response)
+        if cache_mode == 'ON':
+            _semantic_cache().insert(prompt, model, temperature,
+                                     embedding, code, ai_message)
         return code, ai_message, None
     
-    elif props.provider == 'OLLAMA':
+    elif provider == 'OLLAMA':
         # TODO: Implement Ollama support
         return None, None, "Ollama support coming soon!"
     
@@ -248,12 +486,36 @@ Be conversational and helpful!"""
         return generate_demo_code(prompt), "Here's a simple example:", None
 
 
-def generate_demo_code(prompt: str) -> str:
-    """Generate simple demo code for testing"""
-    p = prompt.lower()
-    
-    if "cube" in p or "box" in p:
-        return """import bpy
+# First markdown code fence plus the text before it, captured in one
+# scan instead of chained `in`/`split` passes over the whole response
+_CODE_RE = re.compile(r"(.*?)```(?:python)?\s*\n?(.*?)```", re.S)
+
+
+def extract_code_and_message(full_response: str) -> tuple:
+    """Split an AI response into (code, conversational message)
+
+    Pulls the first markdown code block out as code and uses the text
+    before it as the message, falling back to the whole response.
+    """
+    m = _CODE_RE.search(full_response)
+    if m:
+        ai_message = m.group(1).strip()
+        code = m.group(2).strip()
+    else:
+        ai_message = full_response
+        code = full_response
+
+    # If no message before code, create a friendly one
+    if not ai_message or ai_message == full_response:
+        ai_message = "I've generated the code for you! ✨"
+
+    return code, ai_message
+
+
+# Demo templates built once at import - the literals are multi-line so
+# CPython doesn't reliably intern them, and a keyword dict replaces the
+# old chain of `in` checks with one pass over the prompt's tokens
+_DEMO_CUBE = """import bpy
 
 def rendermind_action(context):
     # Create a cube
@@ -261,9 +523,8 @@ def rendermind_action(context):
     cube = bpy.context.active_object
     cube.name = "RenderMind_Cube"
 """
-    
-    elif "sphere" in p or "ball" in p:
-        return """import bpy
+
+_DEMO_SPHERE = """import bpy
 
 def rendermind_action(context):
     # Create a sphere
@@ -271,9 +532,8 @@ def rendermind_action(context):
     sphere = bpy.context.active_object
     sphere.name = "RenderMind_Sphere"
 """
-    
-    elif "cylinder" in p or "vase" in p:
-        return """import bpy
+
+_DEMO_CYLINDER = """import bpy
 
 def rendermind_action(context):
     # Create a cylinder (vase-like)
@@ -281,9 +541,8 @@ def rendermind_action(context):
     cylinder = bpy.context.active_object
     cylinder.name = "RenderMind_Cylinder"
 """
-    
-    else:
-        return """import bpy
+
+_DEMO_DEFAULT = """import bpy
 
 def rendermind_action(context):
     # Create a default object
@@ -292,6 +551,24 @@ def rendermind_action(context):
     obj.name = "RenderMind_Object"
 """
 
+_DEMO = {
+    "cube": _DEMO_CUBE,
+    "box": _DEMO_CUBE,
+    "sphere": _DEMO_SPHERE,
+    "ball": _DEMO_SPHERE,
+    "cylinder": _DEMO_CYLINDER,
+    "vase": _DEMO_CYLINDER,
+}
+
+
+def generate_demo_code(prompt: str) -> str:
+    """Generate simple demo code for testing"""
+    for token in prompt.lower().split():
+        code = _DEMO.get(token)
+        if code:
+            return code
+    return _DEMO_DEFAULT
+
 
 # Legacy functions for compatibility
 def plan_from_prompt(prompt: str, context_meta: dict = None) -> str:
@@ -302,13 +579,53 @@ def plan_from_prompt(prompt: str, context_meta: dict = None) -> str:
     return code
 
 
+# Upper bound on concurrent API calls from the fallback fan-out path,
+# so a high preview count can't stampede the provider's rate limit
+MAX_PARALLEL_CALLS = 4
+
+
 def generate_variants(prompt: str, n: int = 2):
-    """Generate multiple code variations"""
+    """Generate multiple code variations.
+
+    For the API provider this is a single request with n sampled
+    choices - one prompt charge and one rate-limit unit instead of n.
+    Other providers fall back to a parallel per-prompt fan-out.
+    """
+    # Resolved here on the main thread; the fan-out workers below must
+    # not read bpy.context themselves
+    settings = resolve_generation_settings()
+
+    if settings['provider'] == 'OPENAI':
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user",
+             "content": f"Create Blender Python code for: {prompt}. Provide a distinct variation."}
+        ]
+        contents, error = call_openai_api(
+            messages, settings['model'], settings['temperature'], n=n,
+            api_key=settings['api_key'])
+        if not error:
+            # n=1 (preview_count's minimum) returns a bare string -
+            # normalize so the loop iterates responses, not characters
+            if isinstance(contents, str):
+                contents = [contents]
+            variants = []
+            for full_response in contents:
+                code, _ = extract_code_and_message(full_response)
+                if code:
+                    variants.append(code)
+            if variants:
+                return variants
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    prompts = [f"{prompt} (variation {i+1})" for i in range(n)]
     variants = []
-    for i in range(n):
-        code, error = generate_blender_code(f"{prompt} (variation {i+1})")
-        if code:
-            variants.append(code)
+    with ThreadPoolExecutor(max_workers=min(n, MAX_PARALLEL_CALLS)) as ex:
+        for code, ai_message, error in ex.map(
+                lambda p: generate_blender_code(p, settings=settings), prompts):
+            if code:
+                variants.append(code)
     return variants if variants else [generate_demo_code(prompt)]
 
 
@@ -317,4 +634,9 @@ def register():
 
 
 def unregister():
-    pass
+    global _SESSION
+    if _SEMANTIC_CACHE is not None:
+        _SEMANTIC_CACHE.flush()
+    if _SESSION is not None:
+        _SESSION.close()
+        _SESSION = None
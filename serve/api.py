@@ -1,23 +1,45 @@
 # serve/api.py
-from flask import Flask, request, jsonify
+import asyncio
 import os
+import threading
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi import Request
+import model_interface
 from model_interface import generate_code
 
-app = Flask(__name__)
+# FastAPI + uvicorn replaces the single-threaded Flask dev server: the
+# event loop keeps accepting and parsing requests while generation runs,
+# and the blocking model call is pushed to the default thread pool so
+# it never stalls the loop.
+app = FastAPI()
 
-@app.route("/health", methods=["GET"])
-def health():
-    return jsonify({"status":"ok"})
+@app.on_event("startup")
+async def warm_up():
+    # Kick the model load off in the background at boot so /health is
+    # instant from process start and /ready flips once loading finishes
+    threading.Thread(target=model_interface._load, daemon=True).start()
 
-@app.route("/generate", methods=["POST"])
-def generate():
-    data = request.get_json() or {}
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    if model_interface.is_ready():
+        return {"status": "ready"}
+    return JSONResponse({"status": "loading"}, status_code=503)
+
+@app.post("/generate")
+async def generate(request: Request):
+    data = await request.json() or {}
     instruction = data.get("instruction") or data.get("prompt") or ""
     if not instruction:
-        return jsonify({"error":"no instruction provided"}), 400
-    res = generate_code(instruction)
-    return jsonify(res)
+        return JSONResponse({"error": "no instruction provided"}, status_code=400)
+    res = await asyncio.get_event_loop().run_in_executor(None, generate_code, instruction)
+    return res
 
 if __name__ == "__main__":
+    import uvicorn
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port)
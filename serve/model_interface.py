@@ -1,7 +1,7 @@
 # serve/model_interface.py
-import os, torch
-from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
-from peft import PeftModel
+import copy
+import os
+import threading
 
 # config picks up env or defaults
 BASE_MODEL = os.environ.get("BASE_MODEL", "codellama/CodeLlama-7b-Instruct-hf")
@@ -10,31 +10,33 @@ HF_TOKEN = os.environ.get("HF_TOKEN", None)
 MAX_NEW_TOKENS = int(os.environ.get("MAX_NEW_TOKENS", 256))
 TEMPERATURE = float(os.environ.get("TEMPERATURE", 0.15))
 
-# bitsandbytes 4-bit inference config
-bnb_config = BitsAndBytesConfig(
-    load_in_4bit=True,
-    bnb_4bit_use_double_quant=True,
-    bnb_4bit_quant_type="nf4",
-    bnb_4bit_compute_dtype=torch.float16
-)
+# When set (e.g. http://localhost:8000/v1), requests are forwarded to a
+# vLLM OpenAI-compatible server instead of running transformers.generate
+# in-process. vLLM's continuous batching shares GPU forward passes
+# between concurrent requests, so throughput scales with batch size
+# instead of serializing on one model.generate call at a time. Launch:
+#   python -m vllm.entrypoints.openai.api_server \
+#       --model codellama/CodeLlama-7b-Instruct-hf \
+#       --enable-lora --lora-modules rm=../models/codellama_adapter
+VLLM_URL = os.environ.get("VLLM_URL")
+VLLM_MODEL = os.environ.get("VLLM_MODEL", "rm")
 
-print("MODEL INTERFACE: Loading tokenizer from adapter:", ADAPTER_PATH)
-tokenizer = AutoTokenizer.from_pretrained(ADAPTER_PATH, use_fast=True)
-if getattr(tokenizer, "pad_token", None) is None:
-    tokenizer.pad_token = tokenizer.eos_token
-
-print("MODEL INTERFACE: Loading base model and attaching adapter (this may take some time)...")
-base = AutoModelForCausalLM.from_pretrained(
-    BASE_MODEL,
-    quantization_config=bnb_config,
-    device_map="auto",
-    trust_remote_code=True,
-    use_auth_token=HF_TOKEN
-)
-model = PeftModel.from_pretrained(base, ADAPTER_PATH, device_map="auto")
-model.eval()
-device = next(model.parameters()).device
-print("MODEL INTERFACE: model loaded on", device)
+# Path to an AWQ/GPTQ-converted base model. int4 weight-only quant beats
+# bnb nf4 on throughput on most GPUs (half the weight bandwidth of fp16
+# and no dequant-to-fp16 matmul detour). Produce one offline with awq or
+# auto-gptq and point this at it; unset keeps the bnb nf4 default.
+QUANTIZED_MODEL_PATH = os.environ.get("QUANTIZED_MODEL_PATH")
+
+# torch.compile with CUDA graphs removes per-token Python dispatch
+# overhead - decoding a 7B model at batch 1 is memory- and
+# dispatch-bound, so this is where eager mode loses the most
+TORCH_COMPILE = os.environ.get("TORCH_COMPILE", "1") != "0"
+
+# Optional draft model for speculative decoding (e.g.
+# TinyLlama/TinyLlama-1.1B-Chat-v1.0). The draft proposes K tokens per
+# target forward pass; at typical acceptance rates that cuts target
+# model calls 2-3x. Unset means no assistant is loaded.
+ASSISTANT_MODEL = os.environ.get("ASSISTANT_MODEL")
 
 # Basic static safety blacklist
 BLACKLIST = ["open(", "subprocess", "socket", "eval(", "exec(", "requests", "__import__", "os.system", "os.popen"]
@@ -45,20 +47,185 @@ def safety_block(code_str):
             return True, token
     return False, None
 
+# Static prompt prefix, identical for every request - its token IDs and
+# key/value states are computed once at load and reused, so per-request
+# prefill only covers the instruction suffix
+PROMPT_PREFIX = (
+    "You are RenderMind: convert a natural language instruction into Blender Python (bpy) code. "
+    "Return ONLY python code inside the function wrapper. Do NOT add explanations.\n\n"
+    "### Instruction:\n"
+)
+PROMPT_SUFFIX = "\n\n### Response (Python code only):\n"
+
 def build_prompt(instr: str) -> str:
-    return (
-        "You are RenderMind: convert a natural language instruction into Blender Python (bpy) code. "
-        "Return ONLY python code inside the function wrapper. Do NOT add explanations.\n\n"
-        f"### Instruction:\n{instr}\n\n### Response (Python code only):\n"
+    return f"{PROMPT_PREFIX}{instr}{PROMPT_SUFFIX}"
+
+# Model state is loaded lazily behind _load(): importing this module (or
+# probing /health) no longer pays the multi-gigabyte torch/transformers
+# startup, and orchestrators can probe readiness separately via /ready.
+_LOAD_LOCK = threading.Lock()
+_LOADED = False
+
+torch = None
+tokenizer = None
+model = None
+assistant = None
+device = None
+PREFIX_IDS = None
+SUFFIX_IDS = None
+PREFIX_KV = None
+
+def is_ready() -> bool:
+    """True once the backend can serve (vLLM forwarding is always ready)"""
+    return _LOADED or VLLM_URL is not None
+
+def _load():
+    """Load tokenizer, model and prefix cache once, thread-safe"""
+    global _LOADED, torch, tokenizer, model, assistant, device
+    global PREFIX_IDS, SUFFIX_IDS, PREFIX_KV
+    if _LOADED or VLLM_URL is not None:
+        return
+    with _LOAD_LOCK:
+        if _LOADED:
+            return
+
+        import torch as _torch
+        from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+        from peft import PeftModel
+        torch = _torch
+
+        print("MODEL INTERFACE: Loading tokenizer from adapter:", ADAPTER_PATH)
+        tokenizer = AutoTokenizer.from_pretrained(ADAPTER_PATH, use_fast=True)
+        if getattr(tokenizer, "pad_token", None) is None:
+            tokenizer.pad_token = tokenizer.eos_token
+
+        print("MODEL INTERFACE: Loading base model and attaching adapter (this may take some time)...")
+        if QUANTIZED_MODEL_PATH:
+            base = AutoModelForCausalLM.from_pretrained(
+                QUANTIZED_MODEL_PATH,
+                torch_dtype=torch.float16,
+                device_map="auto",
+                trust_remote_code=True,
+                use_auth_token=HF_TOKEN
+            )
+        else:
+            # bitsandbytes 4-bit inference config
+            bnb_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_use_double_quant=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.float16
+            )
+            base = AutoModelForCausalLM.from_pretrained(
+                BASE_MODEL,
+                quantization_config=bnb_config,
+                device_map="auto",
+                trust_remote_code=True,
+                use_auth_token=HF_TOKEN
+            )
+        model = PeftModel.from_pretrained(base, ADAPTER_PATH, device_map="auto")
+        model.eval()
+        device = next(model.parameters()).device
+        print("MODEL INTERFACE: model loaded on", device)
+
+        if TORCH_COMPILE:
+            model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+            # Warm up so the first real request doesn't pay the compile
+            with torch.no_grad():
+                warmup = tokenizer("warmup", return_tensors="pt").to(device)
+                model.generate(**warmup, max_new_tokens=4)
+            print("MODEL INTERFACE: torch.compile warmup done")
+
+        if ASSISTANT_MODEL:
+            print("MODEL INTERFACE: loading draft model for speculative decoding:", ASSISTANT_MODEL)
+            assistant = AutoModelForCausalLM.from_pretrained(
+                ASSISTANT_MODEL,
+                torch_dtype=torch.float16,
+                device_map="auto"
+            )
+            assistant.eval()
+
+        PREFIX_IDS = tokenizer(PROMPT_PREFIX, return_tensors="pt").input_ids.to(device)
+        SUFFIX_IDS = tokenizer(
+            PROMPT_SUFFIX, return_tensors="pt", add_special_tokens=False
+        ).input_ids.to(device)
+        with torch.no_grad():
+            PREFIX_KV = model(PREFIX_IDS, use_cache=True).past_key_values
+        print("MODEL INTERFACE: prefix KV cache primed,", PREFIX_IDS.shape[-1], "tokens")
+
+        _LOADED = True
+
+def _generate_vllm(instruction: str, max_new_tokens: int, temperature: float) -> dict:
+    import requests
+    prompt = build_prompt(instruction)
+    resp = requests.post(
+        f"{VLLM_URL}/completions",
+        json={
+            "model": VLLM_MODEL,
+            "prompt": prompt,
+            "max_tokens": max_new_tokens,
+            "temperature": temperature,
+        },
+        timeout=120,
     )
+    resp.raise_for_status()
+    code = resp.json()["choices"][0]["text"].strip()
+    blocked, reason = safety_block(code)
+    return {"instruction": instruction, "code": "" if blocked else code, "safety_blocked": blocked, "safety_reason": reason}
 
 def generate_code(instruction: str, max_new_tokens: int = MAX_NEW_TOKENS, temperature: float = TEMPERATURE) -> dict:
-    prompt = build_prompt(instruction)
-    inputs = tokenizer(prompt, return_tensors="pt").to(device)
+    if VLLM_URL is not None:
+        return _generate_vllm(instruction, max_new_tokens, temperature)
+    _load()
+    # Only the instruction is tokenized per call - the static prefix and
+    # suffix token tensors live on the device already, so per-request
+    # tokenizer work and host-to-device copies cover just the new text
+    instr_ids = tokenizer(
+        instruction, return_tensors="pt", add_special_tokens=False
+    ).input_ids.to(device, non_blocking=True)
+    input_ids = torch.cat([PREFIX_IDS, instr_ids, SUFFIX_IDS], dim=1)
+    # At the default near-zero temperature the output is effectively
+    # deterministic anyway - take the greedy path and skip the sampling
+    # machinery instead of paying for it
+    if temperature < 0.2:
+        sampling = {"do_sample": False, "num_beams": 1}
+    else:
+        sampling = {"do_sample": True, "temperature": temperature}
+    if assistant is not None:
+        sampling["assistant_model"] = assistant
     with torch.no_grad():
-        gen = model.generate(**inputs, max_new_tokens=max_new_tokens, temperature=temperature)
-    out = tokenizer.decode(gen[0], skip_special_tokens=True)
-    # extract the code after the prompt to remove prompt echo
-    code = out.split(prompt, 1)[-1].strip()
+        # The cached prefix KV states are copied per call (generate
+        # appends to the cache in place); prefill then only runs over
+        # the instruction suffix instead of the whole prompt
+        gen = model.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            past_key_values=copy.deepcopy(PREFIX_KV),
+            use_cache=True,
+            max_new_tokens=max_new_tokens,
+            **sampling,
+        )
+    # slice the prompt off by token count - no string split needed
+    code = tokenizer.decode(gen[0][input_ids.shape[1]:], skip_special_tokens=True).strip()
     blocked, reason = safety_block(code)
     return {"instruction": instruction, "code": "" if blocked else code, "safety_blocked": blocked, "safety_reason": reason}
+
+def generate_code_batch(instructions: list, max_new_tokens: int = MAX_NEW_TOKENS, temperature: float = TEMPERATURE) -> list:
+    """Generate for several instructions in one padded forward pass,
+    amortizing kernel launch overhead across the batch"""
+    if VLLM_URL is not None:
+        # vLLM batches concurrent requests itself - just forward each
+        return [_generate_vllm(i, max_new_tokens, temperature) for i in instructions]
+    _load()
+    prompts = [build_prompt(instr) for instr in instructions]
+    tokenizer.padding_side = "left"
+    inputs = tokenizer(prompts, return_tensors="pt", padding=True).to(device)
+    with torch.no_grad():
+        gen = model.generate(**inputs, max_new_tokens=max_new_tokens, temperature=temperature)
+    results = []
+    for instr, prompt, ids in zip(instructions, prompts, gen):
+        out = tokenizer.decode(ids, skip_special_tokens=True)
+        code = out.split(prompt, 1)[-1].strip()
+        blocked, reason = safety_block(code)
+        results.append({"instruction": instr, "code": "" if blocked else code, "safety_blocked": blocked, "safety_reason": reason})
+    return results
@@ -0,0 +1,119 @@
+"""
+Semantic response cache - reuse generated code for near-duplicate prompts
+"""
+
+import os
+import pickle
+from collections import OrderedDict
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".rendermind", "cache.pkl")
+
+# Cosine similarity above which a cached response is considered a hit.
+# 0.93 is tight enough that "create a red sphere" and "delete everything"
+# never collide but paraphrases ("make me a red ball") still match.
+SIMILARITY_THRESHOLD = 0.93
+
+MAX_ENTRIES = 512
+
+# Pickling 512 entries with 1536-float embeddings on every insert is
+# the expensive part, not the insert - batch this many inserts per
+# write and let flush() (called on addon unregister) catch the tail
+SAVE_EVERY = 8
+
+
+class SemanticCache:
+    """LRU cache of (embedding, code, message) keyed by
+    (prompt, model, temperature).
+
+    Lookup is a single normalized dot-product scan over the stored
+    embedding matrix - sub-millisecond at this size - so a hit replaces
+    an entire model round-trip with local arithmetic. An embedding call
+    is far cheaper than a completion, and the vector computed for the
+    lookup is reused for the insert on a miss. Settings are part of the
+    key so switching model or temperature never serves stale code.
+    """
+
+    def __init__(self, path=CACHE_PATH, threshold=SIMILARITY_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._entries = OrderedDict()  # (prompt, model, temperature) -> (embedding, code, message)
+        self._unsaved = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                self._entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._entries = OrderedDict()
+        # Entries from before settings joined the key are keyed by bare
+        # prompt strings; drop them rather than risk a wrong-settings hit
+        if self._entries and not isinstance(next(iter(self._entries)), tuple):
+            self._entries = OrderedDict()
+
+    def save(self):
+        """Persist entries to disk, best-effort"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+        self._unsaved = 0
+
+    def flush(self):
+        """Write any batched inserts; called from addon unregister"""
+        if self._unsaved:
+            self.save()
+
+    def lookup(self, prompt, model, temperature, embedding=None):
+        """Return (code, message) for an exact or near match generated
+        under the same model and temperature, else None"""
+        key = (prompt, model, temperature)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+        if embedding is None or not HAS_NUMPY:
+            return None
+
+        # Only same-settings entries are candidates - a paraphrase hit
+        # must not resurrect code from another model or temperature
+        keys = [k for k in self._entries if k[1] == model and k[2] == temperature]
+        if not keys:
+            return None
+
+        q = np.asarray(embedding, dtype=np.float32)
+        q /= np.linalg.norm(q) or 1.0
+        matrix = np.stack([self._entries[k][0] for k in keys])
+        sims = matrix @ q
+        best = int(sims.argmax())
+        if sims[best] >= self.threshold:
+            key = keys[best]
+            self._entries.move_to_end(key)
+            entry = self._entries[key]
+            return entry[1], entry[2]
+        return None
+
+    def insert(self, prompt, model, temperature, embedding, code, message):
+        if not HAS_NUMPY or embedding is None:
+            return
+        vec = np.asarray(embedding, dtype=np.float32)
+        vec /= np.linalg.norm(vec) or 1.0
+        key = (prompt, model, temperature)
+        self._entries[key] = (vec, code, message)
+        self._entries.move_to_end(key)
+        while len(self._entries) > MAX_ENTRIES:
+            self._entries.popitem(last=False)
+        self._unsaved += 1
+        if self._unsaved >= SAVE_EVERY:
+            self.save()
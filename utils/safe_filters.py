@@ -2,6 +2,7 @@
 Safety filters - Static checks for dangerous code patterns
 """
 
+import ast
 import re
 
 
@@ -32,6 +33,48 @@ DANGEROUS_PATTERNS = [
     r'with\s+open',
 ]
 
+# One compiled alternation over all patterns: a single scan of the code
+# instead of one regex pass per pattern. Each pattern keeps its own
+# group so the match can be attributed back to it via m.lastindex.
+_COMBINED = re.compile("|".join(f"({p})" for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+# Optional Aho-Corasick prefilter (pip install pyahocorasick). Most
+# generated code contains none of the dangerous tokens, so a single
+# linear automaton sweep over the literal cores of the patterns decides
+# "clean" without running the regex at all; any hit falls through to
+# the combined regex for exact positions and attribution.
+#
+# Soundness requirement: every DANGEROUS_PATTERNS entry must have a
+# literal here that appears in ALL of its possible matches, or the
+# prefilter would clear code the regex flags. That is why the open
+# family is covered by bare 'open' - 'open(' would miss the
+# whitespace-tolerant 'with\s+open' pattern.
+_PREFILTER_LITERALS = (
+    'os.system', 'os.remove', 'os.rmdir', 'shutil.rmtree', 'subprocess.',
+    'urllib.request', 'requests.', 'socket.', 'http.',
+    'eval(', 'exec(', '__import__', 'compile(',
+    'open', 'file(',
+)
+
+try:
+    import ahocorasick
+    _AUTOMATON = ahocorasick.Automaton()
+    for _lit in _PREFILTER_LITERALS:
+        _AUTOMATON.add_word(_lit, _lit)
+    _AUTOMATON.make_automaton()
+except ImportError:
+    _AUTOMATON = None
+
+# Bytes variant for the detection scan. Every pattern is lowercase
+# ASCII, so lowercasing the input once and matching case-sensitively on
+# bytes skips per-character case folding and _sre's Unicode handling.
+_COMBINED_B = re.compile(b"|".join(f"({p})".encode() for p in DANGEROUS_PATTERNS))
+
+# Same alternation extended to swallow the call's argument list, for
+# sanitize_code's single-pass substitution
+_COMBINED_CALL = re.compile(
+    "(?:" + "|".join(DANGEROUS_PATTERNS) + r")[^)]*\)", re.IGNORECASE)
+
 # Whitelist - only allow these imports
 ALLOWED_IMPORTS = {
     'bpy',
@@ -48,16 +91,27 @@ def check_dangerous_patterns(code):
     Check for dangerous code patterns
     Returns: (is_safe, violations)
     """
-    violations = []
-    
-    for pattern in DANGEROUS_PATTERNS:
-        matches = re.finditer(pattern, code, re.IGNORECASE)
-        for match in matches:
-            violations.append({
-                'pattern': pattern,
-                'match': match.group(),
-                'position': match.start()
-            })
+    lowered = code.lower()
+
+    # Fast path: one automaton sweep proves the absence of every token
+    if _AUTOMATON is not None:
+        for _ in _AUTOMATON.iter(lowered):
+            break
+        else:
+            return True, []
+
+    # Byte offsets equal character offsets for the ASCII code the model
+    # emits; non-ASCII input still matches, positions just shift by the
+    # multi-byte characters before them
+    scan = lowered.encode('utf-8', 'ignore')
+    violations = [
+        {
+            'pattern': DANGEROUS_PATTERNS[match.lastindex - 1],
+            'match': match.group().decode('utf-8', 'ignore'),
+            'position': match.start()
+        }
+        for match in _COMBINED_B.finditer(scan)
+    ]
     
     return len(violations) == 0, violations
 
@@ -79,29 +133,78 @@ def check_imports(code):
     return len(disallowed) == 0, disallowed
 
 
+# Builtins that execute or load arbitrary code/files
+_BANNED_CALLS = frozenset({'eval', 'exec', 'compile', '__import__', 'open', 'file'})
+
+# Modules whose attributes must never be touched, even if a reference
+# leaked into the namespace without an import statement
+_BANNED_MODULES = frozenset({
+    'os', 'subprocess', 'shutil', 'sys', 'socket', 'requests',
+    'urllib', 'http', 'builtins',
+})
+
+
+class SafetyVisitor(ast.NodeVisitor):
+    """Collects safety violations from a parsed syntax tree.
+
+    Operating on the AST instead of the source text avoids false
+    positives on string literals and comments, and catches constructs
+    the regex blacklist can't see (aliased imports, attribute access on
+    a smuggled module reference).
+    """
+
+    def __init__(self):
+        self.violations = []
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            root = alias.name.split('.')[0]
+            if root not in ALLOWED_IMPORTS:
+                self.violations.append(f"import of '{alias.name}'")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        root = (node.module or '').split('.')[0]
+        if root not in ALLOWED_IMPORTS:
+            self.violations.append(f"import from '{node.module}'")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in _BANNED_CALLS:
+            self.violations.append(f"call to '{node.func.id}'")
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id in _BANNED_MODULES:
+            self.violations.append(f"access to '{node.value.id}.{node.attr}'")
+        self.generic_visit(node)
+
+
 def validate_code_safety(code):
     """
     Run all safety checks on code
-    Returns: (is_safe, error_message)
+    Returns: (is_safe, error_message, code_obj)
+
+    code_obj is the compiled bytecode on success - exec it directly so
+    the source isn't parsed a second time downstream.
     """
-    # Check dangerous patterns
-    patterns_safe, violations = check_dangerous_patterns(code)
-    if not patterns_safe:
-        violation_list = ', '.join([v['match'] for v in violations])
-        return False, f"Dangerous patterns detected: {violation_list}"
-    
-    # Check imports
-    imports_safe, disallowed = check_imports(code)
-    if not imports_safe:
-        return False, f"Disallowed imports: {', '.join(disallowed)}"
-    
-    # Check for basic Python syntax (try to compile)
+    # One parse serves both the safety walk and the final compile -
+    # and, unlike the regex blacklist, it understands the code, so
+    # "open(" inside a string literal no longer trips it
     try:
-        compile(code, '<string>', 'exec')
+        tree = ast.parse(code)
     except SyntaxError as e:
-        return False, f"Syntax error: {e}"
+        return False, f"Syntax error: {e}", None
     
-    return True, None
+    visitor = SafetyVisitor()
+    visitor.visit(tree)
+    if visitor.violations:
+        return False, f"Unsafe constructs detected: {', '.join(visitor.violations)}", None
+    
+    # Reuse the tree instead of re-parsing the source
+    code_obj = compile(tree, '<rendermind>', 'exec')
+    
+    return True, None, code_obj
 
 
 def sanitize_code(code):
@@ -109,13 +212,10 @@ def sanitize_code(code):
     Attempt to sanitize code by removing dangerous parts
     Returns: (sanitized_code, warnings)
     """
-    warnings = []
-    sanitized = code
-    
-    # Remove dangerous function calls
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, sanitized, re.IGNORECASE):
-            warnings.append(f"Removed dangerous pattern: {pattern}")
-            sanitized = re.sub(pattern + r'[^)]*\)', '', sanitized, flags=re.IGNORECASE)
+    # Attribute matches to their patterns in one scan, then strip the
+    # offending calls in a single substitution pass
+    matched = {DANGEROUS_PATTERNS[m.lastindex - 1] for m in _COMBINED.finditer(code)}
+    warnings = [f"Removed dangerous pattern: {p}" for p in sorted(matched)]
+    sanitized = _COMBINED_CALL.sub('', code) if matched else code
     
     return sanitized, warnings
@@ -48,9 +48,20 @@ function connectWebSocket() {
             loadMessages();
         };
         
+        // Server may send binary frames (orjson serializes to bytes)
+        ws.binaryType = 'arraybuffer';
+
         ws.onmessage = (event) => {
-            const data = JSON.parse(event.data);
-            handleServerMessage(data);
+            const raw = typeof event.data === 'string' ?
+                event.data :
+                new TextDecoder().decode(event.data);
+            const data = JSON.parse(raw);
+            // Bursts arrive coalesced into one array frame
+            if (Array.isArray(data)) {
+                data.forEach(handleServerMessage);
+            } else {
+                handleServerMessage(data);
+            }
         };
         
         ws.onerror = (error) => {
@@ -531,18 +542,25 @@ function stopRecording() {
     }
 }
 
+// Binary frame type tag, must match the server's BINARY_AUDIO_TAG
+const BINARY_AUDIO_TAG = 0x01;
+
 async function transcribeAudio(audioBlob) {
     try {
         // Show loading state
         voiceBtn.disabled = true;
         voiceIcon.textContent = '⏳';
-        
-        // Send audio to server for transcription
-        sendToServer({
-            type: 'transcribe_audio',
-            audio: await blobToBase64(audioBlob)
-        });
-        
+
+        // Send the raw webm bytes as a tagged binary frame - no JSON
+        // wrapper and no base64 (which inflates the payload by a third)
+        if (ws && ws.readyState === WebSocket.OPEN) {
+            const buf = new Uint8Array(await audioBlob.arrayBuffer());
+            const frame = new Uint8Array(buf.length + 1);
+            frame[0] = BINARY_AUDIO_TAG;
+            frame.set(buf, 1);
+            ws.send(frame);
+        }
+
     } catch (error) {
         console.error('Transcription error:', error);
         alert('Failed to transcribe audio');
@@ -4,10 +4,13 @@ Allows web UI to communicate with Blender addon
 """
 
 import bpy
+import functools
 import json
+import sys
 import threading
+import time
 import asyncio
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import os
 from pathlib import Path
 from datetime import datetime
@@ -16,12 +19,32 @@ try:
     import websockets
     WEBSOCKETS_AVAILABLE = True
     print(f"RenderMind: websockets {websockets.__version__} loaded successfully")
+    # Without the C extension, frame masking and UTF-8 validation run
+    # in pure Python at roughly a tenth of the speed - worth shouting
+    # about since Blender's bundled pip often installs the sdist
+    try:
+        from websockets import speedups  # noqa: F401
+    except ImportError:
+        print("RenderMind: WARNING - websockets C speedups NOT loaded; "
+              "frame masking will run in pure Python (~10x slower). "
+              "Reinstall websockets from a binary wheel.")
 except ImportError as e:
     WEBSOCKETS_AVAILABLE = False
     websockets = None
     print(f"RenderMind: websockets library not found - {e}")
     print("RenderMind: Install with: python -m pip install websockets")
 
+# orjson (C-accelerated) when available - stdlib json dominates CPU on
+# the per-message loads/dumps otherwise. orjson.dumps returns bytes,
+# which websockets sends as a binary frame; the web UI decodes both.
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
 # Global server state
 server_instance = None
 server_thread = None
@@ -29,34 +52,73 @@ http_server = None
 http_thread = None
 server_running = False
 server_loop = None  # Store event loop for broadcasting from timer
-connected_clients = set()
+connected_clients = {}  # websocket -> bounded outbound queue
+connected_count = 0  # plain int for logging; no dict walk or hashing
+
+# Broadcasts queued per client beyond this are dropped oldest-first; a
+# stalled client loses stale updates instead of backing up the loop
+OUTBOUND_QUEUE_SIZE = 32
+
+
+async def _relay(websocket, queue):
+    """Drain one client's outbound queue onto its socket.
+
+    Each client gets its own relay task, so a slow reader only stalls
+    its own queue - broadcast_to_clients never awaits a send. Messages
+    that pile up while a send is in flight are coalesced into a single
+    JSON-array frame, amortizing framing and TCP writes across bursts.
+    """
+    try:
+        while True:
+            message = await queue.get()
+            if queue.empty():
+                await websocket.send(message)
+                continue
+            batch = [message if isinstance(message, bytes) else message.encode()]
+            while not queue.empty():
+                queued = queue.get_nowait()
+                batch.append(queued if isinstance(queued, bytes) else queued.encode())
+            await websocket.send(b'[' + b','.join(batch) + b']')
+    except websockets.exceptions.ConnectionClosed:
+        pass
 
 
 async def handle_client(websocket):
     """Handle incoming WebSocket connections"""
-    global connected_clients
-    connected_clients.add(websocket)
-    print(f"[RenderMind WebSocket] Client connected. Total clients: {len(connected_clients)}")
-    
+    global connected_count
+    queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+    connected_clients[websocket] = queue
+    connected_count += 1
+    relay_task = asyncio.create_task(_relay(websocket, queue))
+    print(f"[RenderMind WebSocket] Client connected. Total clients: {connected_count}")
+
     try:
         async for message in websocket:
             try:
-                data = json.loads(message)
+                if isinstance(message, (bytes, bytearray)):
+                    response = await handle_binary(message)
+                    await websocket.send(_dumps(response))
+                    continue
+
+                data = _loads(message)
                 print(f"[RenderMind] Received: {data.get('type', 'unknown')}")
-                
+
                 # Handle different message types
                 response = await handle_message(data)
-                
-                # Send response back
-                await websocket.send(json.dumps(response))
-                
-            except json.JSONDecodeError:
-                await websocket.send(json.dumps({
+
+                # Handlers may return a pre-serialized payload (cached
+                # blobs); only dict responses need encoding here
+                if not isinstance(response, (bytes, str)):
+                    response = _dumps(response)
+                await websocket.send(response)
+
+            except ValueError:
+                await websocket.send(_dumps({
                     'type': 'error',
                     'message': 'Invalid JSON'
                 }))
             except Exception as e:
-                await websocket.send(json.dumps({
+                await websocket.send(_dumps({
                     'type': 'error',
                     'message': str(e)
                 }))
@@ -64,227 +126,398 @@ async def handle_client(websocket):
     except websockets.exceptions.ConnectionClosed:
         print("[RenderMind WebSocket] Client disconnected")
     finally:
-        connected_clients.remove(websocket)
+        if connected_clients.pop(websocket, None) is not None:
+            connected_count -= 1
+        relay_task.cancel()
 
 
-async def handle_message(data):
-    """Process messages from web UI"""
-    msg_type = data.get('type')
-    
-    if msg_type == 'ping':
-        return {'type': 'pong', 'timestamp': datetime.now().isoformat()}
-    
-    elif msg_type == 'transcribe_audio':
-        # Handle voice transcription using OpenAI Whisper
-        audio_base64 = data.get('audio', '')
-        
+# First byte of a binary client frame says what the payload is
+BINARY_AUDIO_TAG = 0x01
+
+# Chat timestamps only carry minute resolution, so the strftime result
+# is cached per minute - the format-string parse and locale lookup run
+# once instead of three or four times per handled message
+_last_ts_min = None
+_last_ts_str = ""
+
+
+def _now_hhmm():
+    global _last_ts_min, _last_ts_str
+    minute = int(time.time()) // 60
+    if minute != _last_ts_min:
+        _last_ts_min = minute
+        _last_ts_str = datetime.now().strftime("%H:%M")
+    return _last_ts_str
+
+
+def _transcribe_audio_blocking(audio_data):
+    """Spool raw audio bytes and transcribe them; runs off the loop"""
+    from . import model_interface
+    import tempfile
+
+    # A raw fd write skips the BufferedWriter stack NamedTemporaryFile
+    # wraps around the file - one memcpy fewer for a multi-MB blob
+    fd, temp_path = tempfile.mkstemp(suffix='.webm')
+    try:
+        os.write(fd, audio_data)
+    finally:
+        os.close(fd)
+
+    try:
+        return model_interface.transcribe_audio(temp_path)
+    finally:
         try:
-            from . import model_interface
-            import base64
-            import tempfile
-            
-            # Decode audio
-            audio_data = base64.b64decode(audio_base64)
-            
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as temp_audio:
-                temp_audio.write(audio_data)
-                temp_path = temp_audio.name
-            
-            # Transcribe using Whisper API
-            text, error = model_interface.transcribe_audio(temp_path)
-            
-            # Clean up temp file
-            import os
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-            
-            if error:
-                return {
-                    'type': 'transcription',
-                    'error': error
-                }
-            
-            return {
-                'type': 'transcription',
-                'text': text
-            }
-            
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def _transcribe_base64_blocking(audio_base64):
+    """Legacy JSON transport: base64 payload instead of a binary frame"""
+    import base64
+    return _transcribe_audio_blocking(base64.b64decode(audio_base64))
+
+
+async def handle_binary(message):
+    """Route a tagged binary frame from a client"""
+    tag = message[0]
+    if tag == BINARY_AUDIO_TAG:
+        # Raw webm bytes straight off the wire - no JSON wrapper, no
+        # base64 decode pass, and a third less traffic than the old
+        # base64-in-JSON transport
+        try:
+            text, error = await asyncio.to_thread(
+                _transcribe_audio_blocking, bytes(message[1:]))
         except Exception as e:
+            return {'type': 'transcription', 'error': str(e)}
+        if error:
+            return {'type': 'transcription', 'error': error}
+        return {'type': 'transcription', 'text': text}
+    return {'type': 'error', 'message': f'Unknown binary frame tag: {tag}'}
+
+
+# Pong payload prefix, pre-encoded - ping is the keepalive hot path
+# (every client, every few seconds), so the reply is spliced from
+# static bytes plus a millisecond timestamp and skips the dict,
+# datetime and JSON-encode machinery entirely
+_PONG_PREFIX = b'{"type":"pong","timestamp":'
+
+
+async def _handle_ping(data):
+    return _PONG_PREFIX + str(int(time.time() * 1000)).encode() + b'}'
+
+
+async def _handle_transcribe_audio(data):
+    # Handle voice transcription using OpenAI Whisper
+    audio_base64 = data.get('audio', '')
+
+    try:
+        # The decode, temp-file write and Whisper upload together take
+        # seconds - run them on a worker thread so the event loop keeps
+        # serving other clients instead of stalling for the whole
+        # upload + transcription window
+        text, error = await asyncio.to_thread(
+            _transcribe_base64_blocking, audio_base64)
+
+        if error:
             return {
                 'type': 'transcription',
-                'error': str(e)
+                'error': error
             }
-    
-    elif msg_type == 'send_message':
-        # User sent a chat message
-        user_message = data.get('content', '') or data.get('message', '')
-        
-        # Add to Blender's chat history (thread-safe)
-        def add_message():
-            from . import model_interface
-            from .blender_addon import blender_utils
-            
-            props = bpy.context.scene.rm_props
-            
-            # Add user message
-            user_msg = props.chat_messages.add()
-            user_msg.role = 'USER'
-            user_msg.content = user_message
-            user_msg.timestamp = datetime.now().strftime("%H:%M")
-            
-            # Get AI response
-            props.is_thinking = True
-            try:
-                code, ai_message, error = model_interface.generate_blender_code(user_message)
-                
-                if error:
-                    # Add error message
-                    error_msg = props.chat_messages.add()
-                    error_msg.role = 'AI'
-                    error_msg.content = f"Sorry, I encountered an error: {error}"
-                    error_msg.timestamp = datetime.now().strftime("%H:%M")
-                    error_msg.status = 'ERROR'
-                    error_msg.error_msg = error
-                    props.is_thinking = False
-                    return {
-                        'type': 'error',
-                        'message': error
-                    }
-                
-                # Add AI message with the conversational response
-                ai_msg = props.chat_messages.add()
-                ai_msg.role = 'AI'
-                ai_msg.content = ai_message  # Use the AI's actual message
-                ai_msg.code = code
-                ai_msg.timestamp = datetime.now().strftime("%H:%M")
-                
-                # Auto-execute if enabled
-                if props.auto_execute:
-                    try:
-                        blender_utils.exec_script_in_current_scene(code)
-                        ai_msg.status = 'SUCCESS'
-                    except Exception as e:
-                        ai_msg.status = 'ERROR'
-                        ai_msg.error_msg = str(e)
-                else:
-                    ai_msg.status = 'NONE'
-                
-                props.is_thinking = False
-                
-                return {
-                    'type': 'new_message',
-                    'message': {
-                        'role': 'assistant',
-                        'content': ai_msg.content,
-                        'code': ai_msg.code,
-                        'timestamp': ai_msg.timestamp,
-                        'status': ai_msg.status
-                    }
-                }
-            except Exception as e:
-                props.is_thinking = False
-                error_msg = props.chat_messages.add()
-                error_msg.role = 'SYSTEM'
-                error_msg.content = f"Error: {str(e)}"
-                error_msg.timestamp = datetime.now().strftime("%H:%M")
-                error_msg.status = 'ERROR'
-                
-                return {
-                    'type': 'message_response',
-                    'success': False,
-                    'error': str(e)
-                }
-        
-        # Run in main thread and broadcast result
-        def run_and_broadcast():
-            result = add_message()
-            if result:
-                # Schedule the broadcast in the event loop
-                asyncio.run_coroutine_threadsafe(
-                    broadcast_to_clients(result),
-                    server_loop
-                )
-            return None
-        
-        bpy.app.timers.register(run_and_broadcast, first_interval=0.01)
-        
-        return {
-            'type': 'message_received',
-            'status': 'processing'
-        }
-    
-    elif msg_type == 'get_messages':
-        # Get all chat messages
-        def get_messages():
-            props = bpy.context.scene.rm_props
-            messages = []
-            for msg in props.chat_messages:
-                messages.append({
-                    'role': msg.role,
-                    'content': msg.content,
-                    'code': msg.code,
-                    'timestamp': msg.timestamp,
-                    'status': msg.status,
-                    'error_msg': msg.error_msg
-                })
-            return messages
-        
-        messages = get_messages()
+
         return {
-            'type': 'messages_list',
-            'messages': messages
+            'type': 'transcription',
+            'text': text
         }
-    
-    elif msg_type == 'execute_code':
-        # Execute code from specific message
-        code = data.get('code', '')
-        
-        def execute():
-            from .blender_addon import blender_utils
-            try:
-                blender_utils.validate_script(code)
-                exec(code, globals())
-                return {'success': True}
-            except Exception as e:
-                return {'success': False, 'error': str(e)}
-        
-        result = execute()
+
+    except Exception as e:
         return {
-            'type': 'execution_result',
-            **result
+            'type': 'transcription',
+            'error': str(e)
         }
-    
-    elif msg_type == 'clear_chat':
-        # Clear chat history
-        def clear():
-            props = bpy.context.scene.rm_props
-            props.chat_messages.clear()
-        
-        bpy.app.timers.register(lambda: clear() or None, first_interval=0.01)
-        
+
+
+# At most two web-triggered generations in flight - the model call is
+# an HTTP round-trip, so two workers keep the pipeline busy without
+# stampeding the provider, and the pool is created on first use
+_generate_pool = None
+
+
+def _get_generate_pool():
+    global _generate_pool
+    if _generate_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _generate_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix='rm-ws-gen')
+    return _generate_pool
+
+
+def _append_chat_message(chat_messages, role, content, code=None,
+                         status=None, error_msg=None):
+    """Append one chat message with every field set in a single burst.
+
+    CollectionProperty has no bulk path for mixed string/int fields
+    (foreach_set only handles one scalar attribute at a time), so the
+    next best thing is keeping the add and all its assignments back to
+    back inside one timer callback - Blender then coalesces the RNA
+    notifications into one UI refresh per tick instead of one per
+    scattered write.
+    """
+    from .blender_addon import blender_utils
+
+    msg = chat_messages.add()
+    msg.role = role
+    msg.content = content
+    if code is not None:
+        msg.code = code
+    msg.timestamp = _now_hhmm()
+    if status is not None:
+        msg.status = status
+    if error_msg is not None:
+        msg.error_msg = error_msg
+    blender_utils.bump_chat_version()
+    return msg
+
+
+def _record_user_message(user_message):
+    """Append the user's message and kick off generation; runs on the
+    main thread as a timer callback"""
+    from . import model_interface
+    from .blender_addon import blender_utils
+
+    props = bpy.context.scene.rm_props
+    _append_chat_message(props.chat_messages, blender_utils.ROLE_USER,
+                         user_message)
+    props.is_thinking = True
+
+    # Provider settings are resolved here, on the main thread, and
+    # handed to the generate worker - it must not read bpy.context
+    settings = model_interface.resolve_generation_settings()
+    asyncio.run_coroutine_threadsafe(
+        _generate_and_broadcast(user_message, settings), server_loop)
+    return None
+
+
+def _record_ai_result(code, ai_message, error):
+    """Store the generation result (and auto-execute) on the main
+    thread, returning the payload to broadcast"""
+    from .blender_addon import blender_utils
+
+    props = bpy.context.scene.rm_props
+    chat_messages = props.chat_messages
+    props.is_thinking = False
+
+    if error:
+        _append_chat_message(chat_messages, blender_utils.ROLE_AI,
+                             f"Sorry, I encountered an error: {error}",
+                             status=blender_utils.STATUS_ERROR,
+                             error_msg=error)
         return {
-            'type': 'chat_cleared',
-            'success': True
+            'type': 'error',
+            'message': error
         }
-    
+
+    # Add AI message with the conversational response
+    ai_msg = _append_chat_message(chat_messages, blender_utils.ROLE_AI,
+                                  ai_message, code=code)
+
+    # Auto-execute if enabled
+    if props.auto_execute:
+        try:
+            blender_utils.exec_script_in_current_scene(code)
+            ai_msg.status = blender_utils.STATUS_SUCCESS
+        except Exception as e:
+            ai_msg.status = blender_utils.STATUS_ERROR
+            ai_msg.error_msg = str(e)
     else:
-        return {
-            'type': 'error',
-            'message': f'Unknown message type: {msg_type}'
+        ai_msg.status = blender_utils.STATUS_NONE
+    # The status/error writes above land after the append already
+    # bumped the version, so bump again
+    blender_utils.bump_chat_version()
+
+    return {
+        'type': 'new_message',
+        'message': {
+            'role': 'assistant',
+            'content': ai_msg.content,
+            'code': ai_msg.code,
+            'timestamp': ai_msg.timestamp,
+            'status': blender_utils.STATUS_NAMES[ai_msg.status]
         }
+    }
+
+
+async def _generate_and_broadcast(user_message, settings):
+    """Run one chat exchange as a pipeline: model call on a worker
+    thread, Blender-side mutation on the main thread via timer, then
+    broadcast from the event loop. The main thread only sees the quick
+    PropertyGroup updates, never the HTTP wait."""
+    def generate():
+        from . import model_interface
+        return model_interface.generate_blender_code(
+            user_message, settings=settings)
+
+    try:
+        loop = asyncio.get_running_loop()
+        code, ai_message, error = await loop.run_in_executor(
+            _get_generate_pool(), generate)
+    except Exception as e:
+        code, ai_message, error = None, None, str(e)
+
+    def record_and_broadcast():
+        result = _record_ai_result(code, ai_message, error)
+        if result:
+            # Schedule the broadcast in the event loop
+            asyncio.run_coroutine_threadsafe(
+                broadcast_to_clients(result),
+                server_loop
+            )
+        return None
+
+    bpy.app.timers.register(record_and_broadcast, first_interval=0.01)
+
+
+async def _handle_send_message(data):
+    # User sent a chat message. The '' default made the first lookup
+    # always falsy-chain into the second; without it, a present
+    # 'content' short-circuits the legacy 'message' key entirely.
+    user_message = data.get('content') or data.get('message') or ''
+
+    # The user message lands in chat history right away; the timer
+    # callback also resolves settings on the main thread and schedules
+    # the generate + execute + broadcast pipeline, so this handler
+    # (and the client's ack) never waits on any of it
+    bpy.app.timers.register(
+        functools.partial(_record_user_message, user_message),
+        first_interval=0.01)
+
+    return {
+        'type': 'message_received',
+        'status': 'processing'
+    }
+
+
+# Serialized chat snapshot, keyed on blender_utils.chat_version - the
+# counter every mutator bumps - so any append, edit or clear
+# invalidates it exactly; repeat get_messages calls (every reconnect
+# and page load) then reuse the serialized bytes instead of walking the
+# whole PropertyGroup collection and re-encoding it
+_messages_blob_key = None
+_messages_blob = None
+
+
+async def _handle_get_messages(data):
+    # Get all chat messages
+    global _messages_blob_key, _messages_blob
+    from .blender_addon import blender_utils
+
+    msgs = bpy.context.scene.rm_props.chat_messages
+    key = blender_utils.chat_version
+
+    if key != _messages_blob_key:
+        messages = []
+        for msg in msgs:
+            messages.append({
+                'role': blender_utils.ROLE_NAMES[msg.role],
+                'content': msg.content,
+                'code': msg.code,
+                'timestamp': msg.timestamp,
+                'status': blender_utils.STATUS_NAMES[msg.status],
+                'error_msg': msg.error_msg
+            })
+        _messages_blob = _dumps({
+            'type': 'messages_list',
+            'messages': messages
+        })
+        _messages_blob_key = key
+
+    return _messages_blob
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_ws_script(code):
+    """Validate and compile a snippet once; re-running the same code
+    (the web UI's Run button) skips the parser and the safety scan"""
+    from .blender_addon import blender_utils
+    blender_utils.validate_script(code)
+    return compile(code, '<rendermind_ws>', 'exec')
+
+
+async def _handle_execute_code(data):
+    # Execute code from specific message
+    code = data.get('code', '')
+
+    def execute():
+        try:
+            exec(_compile_ws_script(code), globals())
+            return {'success': True}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    result = execute()
+    return {
+        'type': 'execution_result',
+        **result
+    }
+
+
+async def _handle_clear_chat(data):
+    # Clear chat history
+    def clear():
+        from .blender_addon import blender_utils
+
+        props = bpy.context.scene.rm_props
+        props.chat_messages.clear()
+        blender_utils.bump_chat_version()
+
+    bpy.app.timers.register(lambda: clear() or None, first_interval=0.01)
+
+    return {
+        'type': 'chat_cleared',
+        'success': True
+    }
+
+
+async def _handle_unknown(data):
+    return {
+        'type': 'error',
+        'message': f"Unknown message type: {data.get('type')}"
+    }
+
+
+# Hash dispatch instead of walking an if/elif chain of string compares
+# for every message
+_HANDLERS = {
+    'ping': _handle_ping,
+    'transcribe_audio': _handle_transcribe_audio,
+    'send_message': _handle_send_message,
+    'get_messages': _handle_get_messages,
+    'execute_code': _handle_execute_code,
+    'clear_chat': _handle_clear_chat,
+}
+
+
+async def handle_message(data):
+    """Process messages from web UI"""
+    handler = _HANDLERS.get(data.get('type'), _handle_unknown)
+    return await handler(data)
 
 
 async def broadcast_to_clients(message):
-    """Send message to all connected clients"""
-    if connected_clients:
-        message_json = json.dumps(message)
-        await asyncio.gather(
-            *[client.send(message_json) for client in connected_clients],
-            return_exceptions=True
-        )
+    """Queue a message for every connected client without blocking"""
+    if not connected_clients:
+        return
+    # Serialized once, shared across every client send
+    message_json = _dumps(message)
+    for queue in connected_clients.values():
+        if queue.full():
+            # Drop the oldest pending message for this client rather
+            # than letting one slow reader back up the event loop
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(message_json)
 
 
 async def start_server(host='localhost', port=8765):
@@ -302,7 +535,27 @@ async def start_server(host='localhost', port=8765):
     
     try:
         print(f"[RenderMind] Calling websockets.serve...")
-        server_instance = await websockets.serve(handle_client, host, port)
+        # permessage-deflate (the library default) burns most of the
+        # send-path CPU for nothing here: chat messages are tiny and
+        # the audio blobs are already-compressed webm. max_size bounds
+        # incoming frames (audio clips) and max_queue bounds buffering.
+        serve_kwargs = {
+            'compression': None,
+            'max_size': 2 ** 22,
+            'max_queue': 64,
+        }
+        # One event loop saturates a single core. True multi-process
+        # workers are off the table inside Blender (every handler needs
+        # main-process bpy state), but SO_REUSEPORT lets an external
+        # relay process share the port for kernel-level load balancing
+        # when someone deploys one - opt-in, since two accidental
+        # Blender instances silently splitting connections would be
+        # worse than a bind error.
+        import socket
+        if os.environ.get('RM_WS_REUSE_PORT') and hasattr(socket, 'SO_REUSEPORT'):
+            serve_kwargs['reuse_port'] = True
+        server_instance = await websockets.serve(
+            handle_client, host, port, **serve_kwargs)
         print(f"[RenderMind WebSocket] ✓ Server started successfully!")
         print(f"[RenderMind] Open web UI at http://localhost:8080")
         print(f"[RenderMind] Waiting for connections...")
@@ -324,6 +577,16 @@ def run_server_thread():
     """Run server in background thread"""
     global server_loop
     try:
+        # uvloop's selector and socket paths are several times faster
+        # than default asyncio on websocket workloads; POSIX-only, and
+        # purely optional
+        if sys.platform != 'win32':
+            try:
+                import uvloop
+                uvloop.install()
+                print("[RenderMind WebSocket] uvloop installed")
+            except ImportError:
+                pass
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         server_loop = loop  # Store for broadcasting from timer
@@ -341,17 +604,23 @@ def start_http_server():
     # Get the web_ui directory path
     addon_dir = Path(__file__).parent
     web_ui_dir = addon_dir / "web_ui"
-    
-    # Change to web_ui directory
-    os.chdir(str(web_ui_dir))
-    
+
     class CustomHandler(SimpleHTTPRequestHandler):
         def log_message(self, format, *args):
             # Suppress HTTP server logs
             pass
-    
+
+    # Serve straight from web_ui via directory= instead of os.chdir,
+    # which is process-wide and would break relative paths everywhere
+    # else in Blender
+    handler = functools.partial(CustomHandler, directory=str(web_ui_dir))
+
     try:
-        http_server = HTTPServer(('localhost', 8080), CustomHandler)
+        # ThreadingHTTPServer handles each request on its own thread,
+        # so the UI's parallel asset fetches (html/js/css) no longer
+        # serialize behind a single connection; the handler's copyfile
+        # already goes through socket.sendfile for zero-copy sends
+        http_server = ThreadingHTTPServer(('localhost', 8080), handler)
         print(f"[RenderMind HTTP] Server started on http://localhost:8080")
         http_server.serve_forever()
     except Exception as e: